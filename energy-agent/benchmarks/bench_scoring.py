@@ -0,0 +1,169 @@
+"""
+Scoring benchmark.
+
+Times the scoring hot paths on synthetic signals at several batch sizes and
+writes a JSON report, so slowdowns in keyword matching, convergence or the
+database round trip show up before they reach production.
+
+Usage:
+    python benchmarks/bench_scoring.py
+    python benchmarks/bench_scoring.py --sizes 1000 10000 --output report.json
+    python benchmarks/bench_scoring.py --baseline report.json   # exit 1 on regression
+"""
+from datetime import datetime
+from typing import Dict, Any, List, Callable
+import argparse
+import json
+import platform
+import tempfile
+import time
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic import generate_signals
+from data.database import SignalDatabase
+from scoring.convergence import ConvergenceIndex, WindowedConvergenceIndex
+from scoring.engine import ScoringEngine, score_signals
+from scoring.features import scan_signal
+
+
+def timed(fn: Callable, repeat: int = 1) -> float:
+    """Best wall time of fn over repeat runs, in seconds."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_in_memory(signals: List[Dict], engine: ScoringEngine, repeat: int) -> Dict[str, float]:
+    """Scoring paths that need no database."""
+    index = ConvergenceIndex(signals)
+    columns = engine.extract_columns(signals, index)
+    combined = engine.combine(columns)
+    components, attention = combined['components'], combined['attention_score']
+
+    return {
+        'keyword_scan': timed(lambda: [scan_signal(s) for s in signals], repeat),
+        'convergence_index': timed(lambda: ConvergenceIndex(signals), repeat),
+        'convergence_match': timed(lambda: [index.match_count(s) for s in signals], repeat),
+        'score': timed(lambda: [engine.score(s, index=index) for s in signals], repeat),
+        'score_signals': timed(lambda: score_signals(signals, engine), repeat),
+        'score_batch': timed(lambda: engine.score_batch(signals, index=index), repeat),
+        'combine': timed(lambda: engine.combine_components(components, attention, columns['domain']), repeat),
+    }
+
+
+def bench_database(signals: List[Dict], engine: ScoringEngine) -> Dict[str, float]:
+    """Insert, read back, score against the stored window and save, on a scratch database."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db = SignalDatabase(str(Path(tmp) / 'bench.db'))
+
+        results['db_insert'] = timed(lambda: db.insert_signals(signals))
+
+        unscored = []
+        results['db_read'] = timed(lambda: unscored.extend(db.get_unscored_signals(limit=len(signals))))
+
+        holder = {}
+        results['db_window'] = timed(lambda: holder.update(index=WindowedConvergenceIndex(db)))
+
+        def score_and_save():
+            batch = engine.score_batch(unscored, index=holder['index'])
+            db.save_scores_bulk((signal['id'], result) for signal, result in zip(unscored, engine.batch_results(batch)))
+        results['db_score_save'] = timed(score_and_save)
+
+        results['db_rescore'] = timed(lambda: engine.rescore(db))
+        db.close()
+    return results
+
+
+def run(sizes: List[int], repeat: int = 1, with_db: bool = True, **generator_args) -> Dict[str, Any]:
+    """Run every benchmark at every size and return the report."""
+    engine = ScoringEngine({'smr': 1.2, 'fusion': 0.8})
+    results = []
+    for size in sizes:
+        signals = generate_signals(size, **generator_args)
+        timings = bench_in_memory(signals, engine, repeat)
+        if with_db:
+            timings.update(bench_database(signals, engine))
+        for name, seconds in timings.items():
+            results.append({
+                'size': size,
+                'benchmark': name,
+                'seconds': round(seconds, 6),
+                'per_signal_us': round(seconds / size * 1e6, 3)
+            })
+            print(f"{size:>8} {name:<18} {seconds:10.3f}s {seconds / size * 1e6:10.1f} us/signal")
+
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {'sizes': sizes, 'repeat': repeat, **generator_args},
+        'results': results
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """Benchmarks slower than baseline by more than the tolerance factor."""
+    previous = {(r['size'], r['benchmark']): r['seconds'] for r in baseline.get('results', [])}
+    regressions = []
+    for result in report['results']:
+        before = previous.get((result['size'], result['benchmark']))
+        if before and result['seconds'] > before * tolerance:
+            regressions.append({**result, 'baseline_seconds': before, 'ratio': round(result['seconds'] / before, 2)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the scoring engine on synthetic signals')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='Batch sizes to benchmark')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='Runs per in-memory benchmark (best time is reported)')
+    parser.add_argument('--no-db', action='store_true',
+                        help='Skip the database round trip')
+    parser.add_argument('--overlap', type=float, default=0.5,
+                        help='Share of entities drawn from the shared tier/technology pools')
+    parser.add_argument('--text-words', type=int, default=120,
+                        help='Words of title + abstract per signal')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed for the generator')
+    parser.add_argument('--output', default='benchmark_report.json',
+                        help='Where to write the JSON report')
+    parser.add_argument('--baseline',
+                        help='Earlier report to compare against; exits 1 on regression')
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help='Allowed slowdown factor against the baseline')
+    args = parser.parse_args()
+
+    report = run(
+        args.sizes, repeat=args.repeat, with_db=not args.no_db,
+        entity_overlap=args.overlap, text_words=args.text_words, seed=args.seed
+    )
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        report['baseline'] = args.baseline
+        report['regressions'] = regressions
+        for r in regressions:
+            print(f"REGRESSION {r['size']} {r['benchmark']}: {r['seconds']:.3f}s "
+                  f"vs {r['baseline_seconds']:.3f}s ({r['ratio']}x)")
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,5 +2,6 @@
 from .arxiv import ArxivCollector
 from .sec import SECCollector
 from .osint import OSINTCollector
+from .executor import CollectorExecutor
 
-__all__ = ["ArxivCollector", "SECCollector", "OSINTCollector"]
+__all__ = ["ArxivCollector", "SECCollector", "OSINTCollector", "CollectorExecutor"]
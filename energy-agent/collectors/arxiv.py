@@ -10,19 +10,25 @@ Relevant categories:
 - cond-mat (Condensed Matter)
 - quant-ph (Quantum Physics)
 """
-import requests
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, BinaryIO
+import io
 import logging
-import time
 import re
 
 from .base import BaseCollector
 from config.settings import TECHNOLOGY_KEYWORDS, TIER_1_COMPANIES, TIER_2_COMPANIES
+from scoring.features import get_matcher, matched_companies, technology_domains
 
 logger = logging.getLogger(__name__)
 
+ATOM_NS = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'arxiv': 'http://arxiv.org/schemas/atom'
+}
+ATOM_ENTRY = '{http://www.w3.org/2005/Atom}entry'
+
 
 class ArxivCollector(BaseCollector):
     """Collector for ArXiv academic papers."""
@@ -30,7 +36,7 @@ class ArxivCollector(BaseCollector):
     def __init__(self):
         super().__init__('arxiv')
         self.base_url = "http://export.arxiv.org/api/query"
-        self.rate_limit_delay = 3.0  # ArXiv asks for 3 seconds between requests
+        self.page_size = 100
         
         # Relevant ArXiv categories
         self.categories = [
@@ -53,22 +59,10 @@ class ArxivCollector(BaseCollector):
         if date_from is None:
             date_from = date_to - timedelta(days=7)  # Last week
         
-        all_signals = []
-        
-        # Search each technology domain
-        for domain, keywords in TECHNOLOGY_KEYWORDS.items():
-            logger.info(f"Searching ArXiv for {domain} papers...")
-            try:
-                signals = self._search_domain(domain, keywords[:3])  # Limit keywords
-                all_signals.extend(signals)
-                time.sleep(self.rate_limit_delay)
-            except Exception as e:
-                logger.error(f"Error collecting {domain} from ArXiv: {e}")
-        
         # Deduplicate by ArXiv ID
         seen = set()
         unique_signals = []
-        for sig in all_signals:
+        for sig in self.iter_signals(date_from, date_to):
             if sig['source_id'] not in seen:
                 seen.add(sig['source_id'])
                 unique_signals.append(sig)
@@ -76,8 +70,45 @@ class ArxivCollector(BaseCollector):
         logger.info(f"Collected {len(unique_signals)} unique papers from ArXiv")
         return unique_signals
     
-    def _search_domain(self, domain: str, keywords: List[str]) -> List[Dict[str, Any]]:
-        """Search ArXiv for papers matching keywords."""
+    def iter_signals(self, date_from: datetime, date_to: datetime) -> Iterator[Dict[str, Any]]:
+        """
+        Stream papers for every technology domain, one signal at a time.
+        
+        Only one result page per domain is held in memory, so large backfills
+        run in constant memory. Signals are not deduplicated across domains.
+        """
+        # Search each technology domain
+        for domain, keywords in TECHNOLOGY_KEYWORDS.items():
+            logger.info(f"Searching ArXiv for {domain} papers...")
+            try:
+                since = self._since(domain, date_from)
+                newest = None
+                for page in self._search_pages(domain, keywords[:3], since, date_to):  # Limit keywords
+                    for sig in self._filter_new(domain, page, since, date_to):
+                        if newest is None or sig['date'] > newest['date']:
+                            newest = sig
+                        yield sig
+                if newest is not None:
+                    self._advance_watermark(domain, [newest])
+            except Exception as e:
+                logger.error(f"Error collecting {domain} from ArXiv: {e}")
+                self._record_error()
+    
+    def _search_pages(
+        self,
+        domain: str,
+        keywords: List[str],
+        since: datetime = None,
+        until: datetime = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Search ArXiv for papers matching keywords, yielding one page of signals at a time.
+        
+        Results come newest first and are paged until a page reaches back past
+        `since` (or the per-query cap). When both bounds are given the query is
+        restricted to that submission window server-side, so historical windows
+        don't have to page through everything newer first.
+        """
         
         # Build search query
         # Format: (keyword1 OR keyword2) AND (cat:physics.app-ph OR cat:cond-mat.*)
@@ -85,100 +116,117 @@ class ArxivCollector(BaseCollector):
         category_query = ' OR '.join([f'cat:{cat}' for cat in self.categories])
         
         search_query = f'({keyword_query}) AND ({category_query})'
+        if since is not None and until is not None:
+            search_query += f" AND submittedDate:[{since.strftime('%Y%m%d')}0000 TO {until.strftime('%Y%m%d')}2359]"
         
-        params = {
-            'search_query': search_query,
-            'start': 0,
-            'max_results': 50,
-            'sortBy': 'submittedDate',
-            'sortOrder': 'descending'
-        }
+        def fetch_page(offset: int, size: int) -> List[Dict[str, Any]]:
+            params = {
+                'search_query': search_query,
+                'start': offset,
+                'max_results': size,
+                'sortBy': 'submittedDate',
+                'sortOrder': 'descending'
+            }
+            
+            # Errors propagate: a failed page must not look like the end of results
+            with self._get(self.base_url, params=params, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                # Parse the Atom feed straight off the socket
+                return list(self._iter_entries(response.raw, domain))
         
-        try:
-            response = requests.get(self.base_url, params=params, timeout=30)
-            response.raise_for_status()
-        except requests.RequestException as e:
-            logger.error(f"ArXiv API request failed: {e}")
-            return []
-        
-        # Parse XML response
-        signals = self._parse_response(response.text, domain)
-        return signals
+        def past_window(page: List[Dict[str, Any]]) -> bool:
+            return since is not None and min(s['date'] for s in page).date() < since.date()
+        
+        yield from self._paginate(fetch_page, page_size=self.page_size, stop=past_window)
     
     def _parse_response(self, xml_text: str, domain: str) -> List[Dict[str, Any]]:
-        """Parse ArXiv API XML response."""
-        signals = []
-        
-        # Define namespace
-        ns = {
-            'atom': 'http://www.w3.org/2005/Atom',
-            'arxiv': 'http://arxiv.org/schemas/atom'
-        }
+        """Parse an ArXiv API XML response held in memory."""
+        return list(self._iter_entries(io.BytesIO(xml_text.encode('utf-8')), domain))
+    
+    def _iter_entries(self, source: BinaryIO, domain: str) -> Iterator[Dict[str, Any]]:
+        """
+        Incrementally parse an ArXiv Atom feed, yielding one signal per entry.
         
+        Each entry is discarded from the tree once converted, so memory use
+        does not grow with the size of the feed.
+        """
+        root = None
         try:
-            root = ET.fromstring(xml_text)
-        except ET.ParseError as e:
-            logger.error(f"Failed to parse ArXiv XML: {e}")
-            return []
-        
-        for entry in root.findall('atom:entry', ns):
-            try:
-                # Extract fields
-                arxiv_id = entry.find('atom:id', ns).text
-                # Clean up ID (http://arxiv.org/abs/2401.12345v1 -> 2401.12345)
-                arxiv_id = arxiv_id.split('/')[-1].split('v')[0] if arxiv_id else ''
-                
-                title = entry.find('atom:title', ns).text or ''
-                title = ' '.join(title.split())  # Normalize whitespace
-                
-                abstract = entry.find('atom:summary', ns).text or ''
-                abstract = ' '.join(abstract.split())
-                
-                published = entry.find('atom:published', ns).text
-                pub_date = self._parse_date(published)
+            for event, elem in ET.iterparse(source, events=('start', 'end')):
+                if root is None:
+                    root = elem
+                if event != 'end' or elem.tag != ATOM_ENTRY:
+                    continue
                 
-                # Get authors
-                authors = []
-                for author in entry.findall('atom:author', ns):
-                    name = author.find('atom:name', ns)
-                    if name is not None and name.text:
-                        authors.append(name.text)
+                signal = self._entry_to_signal(elem, domain)
+                if signal is not None:
+                    yield signal
                 
-                # Get categories
-                categories = []
-                for cat in entry.findall('atom:category', ns):
-                    term = cat.get('term')
-                    if term:
-                        categories.append(term)
-                
-                # Build URL
-                url = f"https://arxiv.org/abs/{arxiv_id}"
-                
-                # Extract entities
-                entities = self._extract_entities(title, abstract, authors, domain)
-                
-                signal = self._standardize_signal(
-                    raw_data={
-                        'authors': authors,
-                        'categories': categories,
-                        'arxiv_id': arxiv_id
-                    },
-                    source_id=arxiv_id,
-                    title=title,
-                    abstract=abstract[:2000],  # Truncate long abstracts
-                    date=pub_date,
-                    url=url,
-                    entities=entities
-                )
-                
-                signal['domain'] = domain
-                signals.append(signal)
-                
-            except Exception as e:
-                logger.warning(f"Failed to parse ArXiv entry: {e}")
-                continue
-        
-        return signals
+                # Drop the processed entry (and anything before it)
+                root.clear()
+        except ET.ParseError as e:
+            logger.error(f"Failed to parse ArXiv XML: {e}")
+            raise
+    
+    def _entry_to_signal(self, entry: ET.Element, domain: str) -> Optional[Dict[str, Any]]:
+        """Convert one Atom entry element into a signal."""
+        ns = ATOM_NS
+        try:
+            # Extract fields
+            arxiv_id = entry.find('atom:id', ns).text
+            # Clean up ID (http://arxiv.org/abs/2401.12345v1 -> 2401.12345)
+            arxiv_id = arxiv_id.split('/')[-1].split('v')[0] if arxiv_id else ''
+            
+            title = entry.find('atom:title', ns).text or ''
+            title = ' '.join(title.split())  # Normalize whitespace
+            
+            abstract = entry.find('atom:summary', ns).text or ''
+            abstract = ' '.join(abstract.split())
+            
+            published = entry.find('atom:published', ns).text
+            pub_date = self._parse_date(published)
+            
+            # Get authors
+            authors = []
+            for author in entry.findall('atom:author', ns):
+                name = author.find('atom:name', ns)
+                if name is not None and name.text:
+                    authors.append(name.text)
+            
+            # Get categories
+            categories = []
+            for cat in entry.findall('atom:category', ns):
+                term = cat.get('term')
+                if term:
+                    categories.append(term)
+            
+            # Build URL
+            url = f"https://arxiv.org/abs/{arxiv_id}"
+            
+            # Extract entities
+            entities = self._extract_entities(title, abstract, authors, domain)
+            
+            signal = self._standardize_signal(
+                raw_data={
+                    'authors': authors,
+                    'categories': categories,
+                    'arxiv_id': arxiv_id
+                },
+                source_id=arxiv_id,
+                title=title,
+                abstract=abstract[:2000],  # Truncate long abstracts
+                date=pub_date,
+                url=url,
+                entities=entities
+            )
+            
+            signal['domain'] = domain
+            return signal
+            
+        except Exception as e:
+            logger.warning(f"Failed to parse ArXiv entry: {e}")
+            return None
     
     def _extract_entities(self, title: str, abstract: str, authors: List[str], domain: str) -> Dict:
         """Extract companies and technologies from paper."""
@@ -188,25 +236,21 @@ class ArxivCollector(BaseCollector):
             'authors': authors[:5]  # Keep top 5 authors
         }
         
-        text = f"{title} {abstract}".lower()
+        hits = get_matcher().scan(f"{title} {abstract}")
         
         # Check for company affiliations/mentions
-        for company in TIER_1_COMPANIES:
-            if company.lower() in text:
-                entities['companies'].append(company)
-                entities['tier'] = 1
-        
-        for company in TIER_2_COMPANIES:
-            if company.lower() in text:
-                entities['companies'].append(company)
-                if 'tier' not in entities:
-                    entities['tier'] = 2
+        tier_1 = matched_companies(hits, 'tier1', TIER_1_COMPANIES)
+        tier_2 = matched_companies(hits, 'tier2', TIER_2_COMPANIES)
+        entities['companies'] = tier_1 + tier_2
+        if tier_1:
+            entities['tier'] = 1
+        elif tier_2:
+            entities['tier'] = 2
         
         # Extract technology mentions
-        for tech_domain, keywords in TECHNOLOGY_KEYWORDS.items():
-            for kw in keywords:
-                if kw.lower() in text and tech_domain not in entities['technologies']:
-                    entities['technologies'].append(tech_domain)
+        for tech_domain in technology_domains(hits):
+            if tech_domain not in entities['technologies']:
+                entities['technologies'].append(tech_domain)
         
         return entities
     
@@ -2,9 +2,18 @@
 Base collector class that all data collectors inherit from.
 """
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional
 import logging
+import threading
+
+import requests
+
+from config.settings import HTTP_TIMEOUT, MAX_RESULTS_PER_QUERY, DEFAULT_MAX_RESULTS
+from .cache import get_response_cache
+from .ratelimit import get_rate_limiter
+from .session import get_session
 
 logger = logging.getLogger(__name__)
 
@@ -12,9 +21,30 @@ logger = logging.getLogger(__name__)
 class BaseCollector(ABC):
     """Abstract base class for all data collectors."""
     
+    # Number of queries a collector may have in flight at once. Requests are
+    # still paced by the shared per-host rate limiter.
+    max_concurrency = 1
+    
+    # Whether collect() honours an arbitrary historical date window. Sources
+    # that only expose recent items are skipped by backfills.
+    supports_backfill = True
+    
     def __init__(self, name: str):
         self.name = name
         self.collected_at = None
+        self.rate_limiter = get_rate_limiter()
+        self.session = get_session()
+        self.max_results = MAX_RESULTS_PER_QUERY.get(name, DEFAULT_MAX_RESULTS)
+        
+        # Optional watermark store (a SignalDatabase). When set, collectors only
+        # fetch items newer than the last run's high-water mark per domain.
+        self.state = None
+        self._pending_watermarks: Dict[str, Dict[str, str]] = {}
+        self._watermark_lock = threading.Lock()
+        
+        # Failed queries per calling thread, so concurrent collect() calls
+        # (backfill chunks) each see only their own
+        self._query_errors = threading.local()
     
     @abstractmethod
     def collect(self, date_from: datetime = None, date_to: datetime = None) -> List[Dict[str, Any]]:
@@ -25,6 +55,14 @@ class BaseCollector(ABC):
             date_from: Start date for collection (default: yesterday)
             date_to: End date for collection (default: today)
             
+        When a state store is attached (self.state), each query domain only
+        fetches items newer than its stored watermark; new watermarks are
+        staged and persisted by commit_watermarks().
+        
+        A query that fails is logged and counted with _record_error() rather
+        than raised, so the other queries still return; callers that must
+        not treat partial results as complete check query_errors.
+            
         Returns:
             List of signal dictionaries with standardized fields:
             - source: str (e.g., 'uspto', 'sec', 'arxiv')
@@ -38,6 +76,211 @@ class BaseCollector(ABC):
         """
         pass
     
+    @property
+    def query_errors(self) -> int:
+        """Queries that failed in this thread since reset_query_errors()."""
+        return getattr(self._query_errors, 'count', 0)
+    
+    def reset_query_errors(self) -> None:
+        """Start counting failed queries afresh for this thread."""
+        self._query_errors.count = 0
+    
+    def _record_error(self) -> None:
+        """Count a failed query against the current thread's collect() call."""
+        self._query_errors.count = self.query_errors + 1
+    
+    def _watermark(self, domain: str) -> Optional[Dict[str, Any]]:
+        """Stored high-water mark for a domain, or None."""
+        if self.state is None:
+            return None
+        return self.state.get_watermark(self.name, domain)
+    
+    def _since(self, domain: str, date_from: Optional[datetime]) -> Optional[datetime]:
+        """
+        Effective start of the collection window for a domain.
+        
+        The later of date_from and the day of the stored watermark; the
+        watermark day itself is re-queried so late same-day items are not lost.
+        """
+        mark = self._watermark(domain)
+        if not mark or not mark.get('last_date'):
+            return date_from
+        try:
+            mark_date = datetime.strptime(mark['last_date'][:10], '%Y-%m-%d')
+        except ValueError:
+            return date_from
+        if date_from is None or mark_date > date_from:
+            logger.debug(f"{self.name}/{domain}: resuming from watermark {mark['last_date']}")
+            return mark_date
+        return date_from
+    
+    def _filter_new(self, domain: str, signals: List[Dict[str, Any]], since: Optional[datetime],
+                    date_to: datetime = None) -> List[Dict[str, Any]]:
+        """Drop signals outside [since, date_to] (by day) and the last item already seen."""
+        mark = self._watermark(domain)
+        last_id = mark.get('last_source_id') if mark else None
+        return [
+            s for s in signals
+            if (since is None or s['date'].date() >= since.date())
+            and (date_to is None or s['date'].date() <= date_to.date())
+            and not (last_id and s['source_id'] == last_id)
+        ]
+    
+    def _advance_watermark(self, domain: str, signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Stage the newest signal date as the domain's watermark. Returns signals unchanged."""
+        if signals:
+            newest = max(signals, key=lambda s: s['date'])
+            self._stage_watermark(domain, newest['date'].strftime('%Y-%m-%d'), newest['source_id'])
+        return signals
+    
+    def _stage_watermark(self, domain: str, last_date: str, last_source_id: str = None) -> None:
+        """
+        Remember a new watermark until commit_watermarks() is called.
+        
+        Watermarks are only persisted once the collected signals have been
+        stored, so a crash between collection and storage loses nothing.
+        """
+        if self.state is None:
+            return
+        with self._watermark_lock:
+            current = self._pending_watermarks.get(domain)
+            if current is None or last_date >= current['last_date']:
+                self._pending_watermarks[domain] = {'last_date': last_date, 'last_source_id': last_source_id}
+    
+    def commit_watermarks(self) -> None:
+        """Persist staged watermarks to the state store."""
+        if self.state is None:
+            return
+        with self._watermark_lock:
+            pending, self._pending_watermarks = self._pending_watermarks, {}
+        for domain, mark in pending.items():
+            self.state.set_watermark(self.name, domain, mark['last_date'], mark['last_source_id'])
+    
+    def _throttle(self, url: str) -> None:
+        """Wait for the per-host rate budget before requesting a URL."""
+        waited = self.rate_limiter.acquire(url)
+        if waited > 0:
+            logger.debug(f"{self.name}: waited {waited:.2f}s for rate limit on {url}")
+    
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the shared pooled session.
+        
+        Waits for the host's rate budget first; retries on connection errors,
+        429 and 5xx are handled by the session.
+        """
+        kwargs.setdefault('timeout', HTTP_TIMEOUT)
+        self._throttle(url)
+        return self.session.request(method, url, **kwargs)
+    
+    def _get(self, url: str, cache: bool = False, **kwargs) -> requests.Response:
+        """
+        GET a URL through the shared session.
+        
+        With cache=True the on-disk response cache is revalidated with a
+        conditional request, and a 304 is answered from disk.
+        """
+        if not cache:
+            return self._request('GET', url, **kwargs)
+        
+        response_cache = get_response_cache()
+        full_url = requests.Request('GET', url, params=kwargs.pop('params', None)).prepare().url
+        entry = response_cache.lookup(full_url)
+        if entry:
+            kwargs['headers'] = {**kwargs.get('headers', {}), **response_cache.conditional_headers(entry)}
+        
+        response = self._request('GET', full_url, **kwargs)
+        if response.status_code == 304 and entry:
+            logger.debug(f"{self.name}: {full_url} not modified, served from cache")
+            return response_cache.load(entry, response)
+        response_cache.store(full_url, response)
+        return response
+    
+    def _post(self, url: str, **kwargs) -> requests.Response:
+        """POST to a URL through the shared session."""
+        return self._request('POST', url, **kwargs)
+    
+    def _paginate(
+        self,
+        fetch_page: Callable[[int, int], List[Any]],
+        page_size: int,
+        max_results: int = None,
+        stop: Callable[[List[Any]], bool] = None,
+        prefetch: bool = True
+    ) -> Iterator[List[Any]]:
+        """
+        Lazily yield result pages until the query is exhausted.
+        
+        Args:
+            fetch_page: Called as fetch_page(offset, size); returns one page of results
+            page_size: Results requested per page
+            max_results: Cap on total results (default: self.max_results)
+            stop: Optional predicate on a page; True means the date window is
+                exhausted and no further pages are needed
+            prefetch: Request the next page in the background while the caller
+                processes the current one. Disable for quota-limited APIs, since
+                one speculative page may be fetched and discarded.
+        
+        Pagination ends on a short or empty page, on stop(page), or at the cap.
+        An exception from fetch_page propagates out of the iterator, so callers
+        can tell a failed query from a finished one and keep their watermark.
+        """
+        cap = self.max_results if max_results is None else max_results
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'{self.name}-prefetch') if prefetch else None
+        
+        def request(offset):
+            size = min(page_size, cap - offset)
+            if pool:
+                return size, pool.submit(fetch_page, offset, size)
+            return size, fetch_page(offset, size)
+        
+        try:
+            offset = 0
+            size, pending = request(offset)
+            while pending is not None:
+                page = pending.result() if pool else pending
+                page = page or []
+                offset += len(page)
+                
+                more = bool(page) and len(page) >= size and not (stop and stop(page))
+                if more and offset >= cap:
+                    logger.warning(f"{self.name}: stopped at {cap} results; older results skipped")
+                    more = False
+                
+                size, pending = request(offset) if more and pool else (size, None)
+                yield page
+                if more and not pool:
+                    size, pending = request(offset)
+        finally:
+            if pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _map_queries(self, query: Callable[[Any], List[Dict[str, Any]]], items: Iterable) -> List[Dict[str, Any]]:
+        """
+        Run query(item) for every item and concatenate the results in item order.
+        
+        Up to max_concurrency queries run at once; a failing query is logged,
+        counted (see query_errors) and contributes no results.
+        """
+        def run(item):
+            try:
+                return query(item)
+            except Exception as e:
+                logger.error(f"{self.name} query failed for {item!r}: {e}")
+                return None
+        
+        items = list(items)
+        if self.max_concurrency <= 1 or len(items) <= 1:
+            results = [run(item) for item in items]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(items))) as pool:
+                results = list(pool.map(run, items))
+        
+        # Counted here, in the caller's thread, not in the pool's workers
+        for _ in range(results.count(None)):
+            self._record_error()
+        return [signal for batch in results if batch is not None for signal in batch]
+    
     def _standardize_signal(self, raw_data: Dict, **kwargs) -> Dict[str, Any]:
         """Convert raw data to standardized signal format."""
         return {
@@ -0,0 +1,187 @@
+"""
+Persistent HTTP response cache with conditional requests.
+
+Responses that carry an ETag or Last-Modified validator are stored on disk,
+keyed by their full request URL. The next request for that URL sends
+If-None-Match / If-Modified-Since, and a 304 reply is answered from disk, so
+unchanged documents (e.g. SEC submissions JSON) are not downloaded again.
+
+Bodies live in one file per URL; a small SQLite index tracks validators,
+sizes and last access times. When the cache grows past its byte budget the
+least recently used entries are evicted.
+"""
+from pathlib import Path
+from typing import Dict, Any, Optional
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from config.settings import HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Response headers kept alongside the cached body
+CACHED_HEADERS = ['Content-Type', 'ETag', 'Last-Modified']
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of HTTP responses on disk."""
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        self.cache_dir = Path(cache_dir or HTTP_CACHE_DIR)
+        self.max_bytes = HTTP_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = str(self.cache_dir / "index.db")
+        self._lock = threading.Lock()
+        self._init_index()
+
+    def _init_index(self):
+        """Initialize the cache index schema."""
+        with sqlite3.connect(self.index_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    headers JSON,
+                    size INTEGER NOT NULL,
+                    stored_at REAL,
+                    accessed_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+            conn.commit()
+
+    @staticmethod
+    def cache_key(url: str) -> str:
+        """Cache key for a fully prepared request URL."""
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the index entry for a URL, or None if not cached."""
+        key = self.cache_key(url)
+        with self._lock, sqlite3.connect(self.index_path) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        if not self._body_path(key).exists():
+            self._delete(key)
+            return None
+        entry['headers'] = json.loads(entry['headers'] or '{}')
+        return entry
+
+    def conditional_headers(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        """Validator headers for revalidating a cached entry."""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load(self, entry: Dict[str, Any], request_response: requests.Response = None) -> requests.Response:
+        """
+        Rebuild a 200 response from a cached entry and mark it recently used.
+
+        Args:
+            entry: Entry returned by lookup()
+            request_response: The 304 reply, used to carry request metadata
+        """
+        key = entry['key']
+        body = self._body_path(key).read_bytes()
+        with self._lock, sqlite3.connect(self.index_path) as conn:
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response._content = body
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.url = entry['url']
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        if request_response is not None:
+            response.request = request_response.request
+            response.elapsed = request_response.elapsed
+        response.from_cache = True
+        return response
+
+    def store(self, url: str, response: requests.Response) -> bool:
+        """Cache a 200 response if it carries a validator. Returns True if stored."""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code != 200 or not (etag or last_modified):
+            return False
+
+        key = self.cache_key(url)
+        body = response.content
+        headers = {h: response.headers[h] for h in CACHED_HEADERS if h in response.headers}
+        now = time.time()
+
+        with self._lock:
+            self._body_path(key).write_bytes(body)
+            with sqlite3.connect(self.index_path) as conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO responses
+                    (key, url, etag, last_modified, headers, size, stored_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (key, url, etag, last_modified, json.dumps(headers), len(body), now, now))
+                conn.commit()
+            self._evict()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and total cached bytes."""
+        with self._lock, sqlite3.connect(self.index_path) as conn:
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {'entries': count, 'bytes': total, 'max_bytes': self.max_bytes}
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its budget. Caller holds the lock."""
+        with sqlite3.connect(self.index_path) as conn:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC").fetchall()
+            evicted = []
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._body_path(key).unlink(missing_ok=True)
+                evicted.append((key,))
+                total -= size
+            conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+            conn.commit()
+        logger.debug(f"Evicted {len(evicted)} cached responses")
+
+    def _delete(self, key: str):
+        """Remove a single entry."""
+        with self._lock, sqlite3.connect(self.index_path) as conn:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            conn.commit()
+        self._body_path(key).unlink(missing_ok=True)
+
+    def _body_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.body"
+
+
+_shared_cache: Optional[ResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+        return _shared_cache
@@ -0,0 +1,249 @@
+"""
+Concurrent collector executor.
+
+Runs every collector in its own worker thread so a collection run takes
+roughly as long as the slowest source rather than the sum of all of them.
+Each collector keeps its own rate budget (its requests still go out one after
+another inside its thread), a failure in one source never affects the others,
+and wall-clock timings are recorded per source.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Tuple
+import logging
+import time
+
+from .base import BaseCollector
+
+logger = logging.getLogger(__name__)
+
+
+def default_collectors() -> List[BaseCollector]:
+    """Instantiate every production collector."""
+    from .uspto import USPTOCollector
+    from .arxiv import ArxivCollector
+    from .sec import SECCollector
+    from .lens import LensPatentCollector, LensScholarCollector
+    from .osint import OSINTCollector
+
+    return [
+        USPTOCollector(),
+        ArxivCollector(),
+        SECCollector(),
+        LensPatentCollector(),
+        LensScholarCollector(),
+        OSINTCollector(),
+    ]
+
+
+def date_chunks(date_from: datetime, date_to: datetime, chunk_days: int) -> List[Tuple[datetime, datetime]]:
+    """
+    Split [date_from, date_to] into consecutive whole-day windows.
+
+    Each window runs from midnight of its first day to the last second of its
+    last day; the final window may be shorter than chunk_days.
+    """
+    chunks = []
+    start = date_from.replace(hour=0, minute=0, second=0, microsecond=0)
+    last_day = date_to.replace(hour=0, minute=0, second=0, microsecond=0)
+    while start <= last_day:
+        end = min(start + timedelta(days=chunk_days - 1), last_day)
+        chunks.append((start, end.replace(hour=23, minute=59, second=59)))
+        start = end + timedelta(days=1)
+    return chunks
+
+
+class CollectorExecutor:
+    """Fan a collection window out to several collectors at once."""
+
+    def __init__(self, collectors: List[BaseCollector] = None, max_workers: int = None, state=None):
+        """
+        Args:
+            collectors: Collectors to run (default: all production collectors)
+            max_workers: Thread pool size (default: one thread per collector)
+            state: Watermark store (SignalDatabase) for incremental collection;
+                None collects the full window every time
+        """
+        self.collectors = collectors if collectors is not None else default_collectors()
+        self.max_workers = max_workers or max(len(self.collectors), 1)
+        self.results: Dict[str, Dict[str, Any]] = {}
+        if state is not None:
+            for collector in self.collectors:
+                collector.state = state
+
+    def run(self, date_from: datetime = None, date_to: datetime = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Run all collectors concurrently over the same date window.
+
+        Returns:
+            Dict keyed by collector name, in collector order, with:
+            - signals: list of collected signals (empty on failure)
+            - count: number of signals
+            - elapsed: wall time in seconds
+            - error: error message, or None on success
+        """
+        if date_to is None:
+            date_to = datetime.now()
+        if date_from is None:
+            date_from = date_to - timedelta(days=1)
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='collector') as pool:
+            futures = [
+                (collector, pool.submit(self._run_one, collector, date_from, date_to))
+                for collector in self.collectors
+            ]
+            results = {collector.name: future.result() for collector, future in futures}
+
+        self.results = results
+        self._log_summary(time.monotonic() - started)
+        return results
+
+    def collect(self, date_from: datetime = None, date_to: datetime = None) -> List[Dict[str, Any]]:
+        """Run all collectors concurrently and return the combined signals."""
+        results = self.run(date_from, date_to)
+        all_signals = []
+        for result in results.values():
+            all_signals.extend(result['signals'])
+        return all_signals
+
+    def backfill(
+        self,
+        date_from: datetime,
+        date_to: datetime,
+        db,
+        chunk_days: int = 7,
+        chunk_workers: int = 2
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Collect a historical date range chunk by chunk and store it.
+
+        Collectors run concurrently; within each collector up to chunk_workers
+        chunks are in flight at once, paced by the shared per-host rate
+        limiter. Every finished chunk is checkpointed in the database, so an
+        interrupted backfill resumes where it stopped. Collectors that can't
+        query historical windows are skipped.
+
+        Args:
+            date_from: First day to collect
+            date_to: Last day to collect
+            db: SignalDatabase that receives signals and checkpoints
+            chunk_days: Days per chunk
+            chunk_workers: Concurrent chunks per collector
+
+        Returns:
+            Dict keyed by collector name with chunk and signal counts
+        """
+        chunks = date_chunks(date_from, date_to, chunk_days)
+        collectors = [c for c in self.collectors if c.supports_backfill]
+        for collector in self.collectors:
+            if not collector.supports_backfill:
+                logger.info(f"Skipping {collector.name}: no historical date window support")
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max(len(collectors), 1), thread_name_prefix='backfill') as pool:
+            futures = [
+                (collector, pool.submit(self._backfill_one, collector, chunks, db, chunk_workers))
+                for collector in collectors
+            ]
+            results = {collector.name: future.result() for collector, future in futures}
+
+        for name, result in results.items():
+            logger.info(
+                f"  {name:<14} {result['elapsed']:7.1f}s  {result['done']}/{result['chunks']} chunks "
+                f"({result['skipped']} resumed, {result['failed']} failed), "
+                f"{result['signals']} signals, {result['new']} new"
+            )
+        logger.info(f"Backfill of {len(chunks)} chunks finished in {time.monotonic() - started:.1f}s")
+        return results
+
+    def _backfill_one(self, collector: BaseCollector, chunks: List[Tuple[datetime, datetime]],
+                      db, chunk_workers: int) -> Dict[str, Any]:
+        """Backfill every pending chunk for one collector."""
+        started = time.monotonic()
+        completed = db.get_completed_chunks(collector.name)
+        pending = [
+            (start, end) for start, end in chunks
+            if (start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')) not in completed
+        ]
+        logger.info(f"{collector.name}: {len(pending)} of {len(chunks)} chunks to backfill")
+
+        def run_chunk(chunk):
+            start, end = chunk
+            key = (start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
+            try:
+                collector.reset_query_errors()
+                signals = collector.collect(start, end) or []
+                new_count = db.insert_signals(signals)
+                if collector.query_errors:
+                    # Keep what was collected, but retry the chunk on resume
+                    error = f"{collector.query_errors} queries failed"
+                    db.save_chunk_progress(collector.name, *key, 'failed', len(signals), error=error)
+                    logger.error(f"{collector.name} {key[0]}..{key[1]}: {error}, {len(signals)} signals kept")
+                    return {'signals': len(signals), 'new': new_count, 'failed': 1}
+                db.save_chunk_progress(collector.name, *key, 'done', len(signals))
+                logger.info(f"{collector.name} {key[0]}..{key[1]}: {len(signals)} signals, {new_count} new")
+                return {'signals': len(signals), 'new': new_count, 'failed': 0}
+            except Exception as e:
+                db.save_chunk_progress(collector.name, *key, 'failed', error=str(e))
+                logger.error(f"{collector.name} {key[0]}..{key[1]} failed: {e}")
+                return {'signals': 0, 'new': 0, 'failed': 1}
+
+        with ThreadPoolExecutor(max_workers=max(chunk_workers, 1),
+                                thread_name_prefix=f'{collector.name}-chunk') as pool:
+            outcomes = list(pool.map(run_chunk, pending))
+
+        failed = sum(o['failed'] for o in outcomes)
+        return {
+            'chunks': len(chunks),
+            'skipped': len(chunks) - len(pending),
+            'done': len(chunks) - failed,
+            'failed': failed,
+            'signals': sum(o['signals'] for o in outcomes),
+            'new': sum(o['new'] for o in outcomes),
+            'elapsed': time.monotonic() - started
+        }
+
+    def commit_watermarks(self) -> None:
+        """Persist every collector's new watermarks. Call after signals are stored."""
+        for collector in self.collectors:
+            try:
+                collector.commit_watermarks()
+            except Exception as e:
+                logger.error(f"Failed to save {collector.name} watermarks: {e}")
+
+    def _run_one(self, collector: BaseCollector, date_from: datetime, date_to: datetime) -> Dict[str, Any]:
+        """Run a single collector, isolating any failure to that source."""
+        logger.info(f"Starting {collector.name} collection...")
+        started = time.monotonic()
+        signals = []
+        error = None
+        try:
+            signals = collector.collect(date_from, date_to) or []
+            collector.collected_at = datetime.now()
+        except Exception as e:
+            error = str(e)
+            logger.error(f"{collector.name} collection failed: {e}")
+        elapsed = time.monotonic() - started
+
+        if error is None:
+            logger.info(f"Collected {len(signals)} {collector.name} signals in {elapsed:.1f}s")
+
+        return {
+            'signals': signals,
+            'count': len(signals),
+            'elapsed': elapsed,
+            'error': error
+        }
+
+    def _log_summary(self, wall_time: float) -> None:
+        """Log per-source timings and the overall wall time."""
+        total = sum(r['count'] for r in self.results.values())
+        busy = sum(r['elapsed'] for r in self.results.values())
+        for name, result in self.results.items():
+            status = f"FAILED ({result['error']})" if result['error'] else f"{result['count']} signals"
+            logger.info(f"  {name:<14} {result['elapsed']:7.1f}s  {status}")
+        logger.info(
+            f"Total signals collected: {total} in {wall_time:.1f}s wall "
+            f"({busy:.1f}s across sources)"
+        )
@@ -7,15 +7,14 @@ Pro tier: £500/year for enhanced access
 
 API docs: https://docs.api.lens.org/
 """
-import requests
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 import logging
-import time
 import os
 
 from .base import BaseCollector
-from config.settings import TECHNOLOGY_KEYWORDS, TIER_1_COMPANIES, TIER_2_COMPANIES
+from config.settings import TECHNOLOGY_KEYWORDS, TIER_2_COMPANIES
+from scoring.features import get_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +25,8 @@ class LensPatentCollector(BaseCollector):
     def __init__(self, api_key: str = None):
         super().__init__('lens_patent')
         self.base_url = "https://api.lens.org/patent/search"
+        self.page_size = 50  # Free tier limit per request
         self.api_key = api_key or os.getenv("LENS_API_KEY", "")
-        self.rate_limit_delay = 2.0
         
         if not self.api_key:
             logger.warning("No Lens.org API key. Get one free at: https://www.lens.org/lens/user/subscriptions")
@@ -48,11 +47,13 @@ class LensPatentCollector(BaseCollector):
         for domain, keywords in TECHNOLOGY_KEYWORDS.items():
             logger.info(f"Collecting {domain} patents from Lens.org...")
             try:
-                signals = self._search_domain(domain, keywords[:3], date_from, date_to)
-                all_signals.extend(signals)
-                time.sleep(self.rate_limit_delay)
+                since = self._since(domain, date_from)
+                signals = self._search_domain(domain, keywords[:3], since, date_to)
+                signals = self._filter_new(domain, signals, since, date_to)
+                all_signals.extend(self._advance_watermark(domain, signals))
             except Exception as e:
                 logger.error(f"Error collecting {domain} from Lens.org: {e}")
+                self._record_error()
         
         # Deduplicate
         seen = set()
@@ -98,7 +99,6 @@ class LensPatentCollector(BaseCollector):
                     ]
                 }
             },
-            "size": 50,  # Free tier limit
             "sort": [{"date_published": "desc"}],
             "include": [
                 "lens_id",
@@ -116,60 +116,58 @@ class LensPatentCollector(BaseCollector):
             "Content-Type": "application/json"
         }
         
-        try:
-            response = requests.post(
+        def fetch_page(offset: int, size: int) -> List[Dict[str, Any]]:
+            # Errors propagate: a failed page must not look like the end of results
+            response = self._post(
                 self.base_url,
                 headers=headers,
-                json=query,
-                timeout=30
+                json={**query, "from": offset, "size": size}
             )
             response.raise_for_status()
-            data = response.json()
-        except requests.RequestException as e:
-            logger.error(f"Lens.org API request failed: {e}")
-            return []
+            return response.json().get('data', [])
         
-        results = data.get('data', [])
         signals = []
         
-        for patent in results:
-            entities = self._extract_entities(patent, domain)
-            lens_id = patent.get('lens_id', '')
-            biblio = patent.get('biblio', {})
+        # No prefetch: every speculative page costs scarce Lens.org quota
+        for results in self._paginate(fetch_page, page_size=self.page_size, prefetch=False):
+            for patent in results:
+                entities = self._extract_entities(patent, domain)
+                lens_id = patent.get('lens_id', '')
+                biblio = patent.get('biblio', {})
             
-            # Title is nested under biblio.invention_title
-            title = ''
-            for t in biblio.get('invention_title', []):
-                if t.get('lang') == 'en':
-                    title = t.get('text', '')
-                    break
-            if not title:
-                titles = biblio.get('invention_title', [])
-                title = titles[0].get('text', '') if titles else ''
+                # Title is nested under biblio.invention_title
+                title = ''
+                for t in biblio.get('invention_title', []):
+                    if t.get('lang') == 'en':
+                        title = t.get('text', '')
+                        break
+                if not title:
+                    titles = biblio.get('invention_title', [])
+                    title = titles[0].get('text', '') if titles else ''
             
-            # Abstract
-            abstract = ''
-            for a in patent.get('abstract', biblio.get('abstract', [])) if isinstance(patent.get('abstract', biblio.get('abstract', [])), list) else []:
-                if isinstance(a, dict) and a.get('lang') == 'en':
-                    abstract = a.get('text', '')
-                    break
-            if not abstract and isinstance(patent.get('abstract'), str):
-                abstract = patent.get('abstract', '')
+                # Abstract
+                abstract = ''
+                for a in patent.get('abstract', biblio.get('abstract', [])) if isinstance(patent.get('abstract', biblio.get('abstract', [])), list) else []:
+                    if isinstance(a, dict) and a.get('lang') == 'en':
+                        abstract = a.get('text', '')
+                        break
+                if not abstract and isinstance(patent.get('abstract'), str):
+                    abstract = patent.get('abstract', '')
             
-            signal = self._standardize_signal(
-                raw_data=patent,
-                source_id=lens_id,
-                title=title,
-                abstract=abstract,
-                date=self._parse_date(patent.get('date_published')),
-                url=f"https://www.lens.org/lens/patent/{lens_id}",
-                entities=entities
-            )
-            signal['domain'] = domain
-            signal['citations'] = patent.get('cited_by_count', 0)
-            signal['family_size'] = patent.get('families', {}).get('simple_family', {}).get('size', 1)
+                signal = self._standardize_signal(
+                    raw_data=patent,
+                    source_id=lens_id,
+                    title=title,
+                    abstract=abstract,
+                    date=self._parse_date(patent.get('date_published')),
+                    url=f"https://www.lens.org/lens/patent/{lens_id}",
+                    entities=entities
+                )
+                signal['domain'] = domain
+                signal['citations'] = patent.get('cited_by_count', 0)
+                signal['family_size'] = patent.get('families', {}).get('simple_family', {}).get('size', 1)
             
-            signals.append(signal)
+                signals.append(signal)
         
         return signals
     
@@ -191,10 +189,8 @@ class LensPatentCollector(BaseCollector):
                 name = str(applicant)
             if name:
                 entities['companies'].append(name)
-                for t1 in TIER_1_COMPANIES:
-                    if t1.lower() in name.lower():
-                        entities['tier'] = 1
-                        break
+                if 'tier1' in get_matcher().scan(name):
+                    entities['tier'] = 1
         
         return entities
     
@@ -213,8 +209,8 @@ class LensScholarCollector(BaseCollector):
     def __init__(self, api_key: str = None):
         super().__init__('lens_scholar')
         self.base_url = "https://api.lens.org/scholarly/search"
+        self.page_size = 50  # Free tier limit per request
         self.api_key = api_key or os.getenv("LENS_API_KEY", "")
-        self.rate_limit_delay = 2.0
     
     def collect(self, date_from: datetime = None, date_to: datetime = None) -> List[Dict[str, Any]]:
         """Collect scholarly articles from Lens.org."""
@@ -232,11 +228,13 @@ class LensScholarCollector(BaseCollector):
         for domain, keywords in TECHNOLOGY_KEYWORDS.items():
             logger.info(f"Collecting {domain} papers from Lens.org...")
             try:
-                signals = self._search_domain(domain, keywords[:3], date_from, date_to)
-                all_signals.extend(signals)
-                time.sleep(self.rate_limit_delay)
+                since = self._since(domain, date_from)
+                signals = self._search_domain(domain, keywords[:3], since, date_to)
+                signals = self._filter_new(domain, signals, since, date_to)
+                all_signals.extend(self._advance_watermark(domain, signals))
             except Exception as e:
                 logger.error(f"Error: {e}")
+                self._record_error()
         
         seen = set()
         unique = [s for s in all_signals if not (s['source_id'] in seen or seen.add(s['source_id']))]
@@ -254,44 +252,41 @@ class LensScholarCollector(BaseCollector):
                     ]
                 }
             },
-            "size": 50,
             "sort": [{"date_published": "desc"}],
             "include": ["lens_id", "title", "abstract", "date_published", "authors", "source", "scholarly_citations_count", "external_ids"]
         }
         
         headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
         
-        try:
-            response = requests.post(self.base_url, headers=headers, json=query, timeout=30)
+        def fetch_page(offset: int, size: int) -> List[Dict]:
+            response = self._post(self.base_url, headers=headers, json={**query, "from": offset, "size": size})
             response.raise_for_status()
-            data = response.json()
-        except requests.RequestException as e:
-            logger.error(f"Lens.org scholar API failed: {e}")
-            return []
+            return response.json().get('data', [])
         
         signals = []
-        for paper in data.get('data', []):
-            lens_id = paper.get('lens_id', '')
-            ext_ids = paper.get('external_ids', [])
-            doi = ''
-            for eid in (ext_ids if isinstance(ext_ids, list) else []):
-                if isinstance(eid, dict) and eid.get('type') == 'doi':
-                    doi = eid.get('value', '')
-                    break
-            url = f"https://doi.org/{doi}" if doi else f"https://www.lens.org/lens/scholar/{lens_id}"
+        for page in self._paginate(fetch_page, page_size=self.page_size, prefetch=False):
+            for paper in page:
+                lens_id = paper.get('lens_id', '')
+                ext_ids = paper.get('external_ids', [])
+                doi = ''
+                for eid in (ext_ids if isinstance(ext_ids, list) else []):
+                    if isinstance(eid, dict) and eid.get('type') == 'doi':
+                        doi = eid.get('value', '')
+                        break
+                url = f"https://doi.org/{doi}" if doi else f"https://www.lens.org/lens/scholar/{lens_id}"
             
-            signal = self._standardize_signal(
-                raw_data=paper,
-                source_id=lens_id,
-                title=paper.get('title', ''),
-                abstract=paper.get('abstract', ''),
-                date=datetime.strptime(paper.get('date_published', '')[:10], '%Y-%m-%d') if paper.get('date_published') else datetime.now(),
-                url=url,
-                entities={'technologies': [domain], 'companies': []}
-            )
-            signal['domain'] = domain
-            signal['citations'] = paper.get('scholarly_citations_count', 0)
-            signals.append(signal)
+                signal = self._standardize_signal(
+                    raw_data=paper,
+                    source_id=lens_id,
+                    title=paper.get('title', ''),
+                    abstract=paper.get('abstract', ''),
+                    date=datetime.strptime(paper.get('date_published', '')[:10], '%Y-%m-%d') if paper.get('date_published') else datetime.now(),
+                    url=url,
+                    entities={'technologies': [domain], 'companies': []}
+                )
+                signal['domain'] = domain
+                signal['citations'] = paper.get('scholarly_citations_count', 0)
+                signals.append(signal)
         
         return signals
 
@@ -1,24 +1,25 @@
 """
 OSINT Collector - Pulls Reddit/News data from Kali box
 """
-import subprocess
 import json
+import logging
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any
 from .base import BaseCollector
+from .osint_mirror import OSINTMirror
 
-# Kali box connection
-KALI_HOST = "192.168.154.193"
-KALI_USER = "oc"
-KALI_PASS = "Apple24"
-KALI_DB = "/home/oc/energy-osint/data/osint.db"
+logger = logging.getLogger(__name__)
 
 
 class OSINTCollector(BaseCollector):
     """Collector for social/news OSINT from Kali scraping node"""
     
-    def __init__(self):
+    # The scraper only holds what it has seen since it started, by scrape time
+    supports_backfill = False
+    
+    def __init__(self, mirror: OSINTMirror = None):
         super().__init__("osint")
+        self._mirror = mirror
         self.source_weights = {
             # Reddit communities - weight by quality
             "wallstreetbets": 0.6,  # Noisy but early signals
@@ -43,71 +44,99 @@ class OSINTCollector(BaseCollector):
             "ars_technica": 0.9,
         }
     
-    def _run_kali_query(self, query: str) -> list[dict]:
-        """Execute SQLite query on Kali box via SSH"""
-        cmd = f"""sshpass -p '{KALI_PASS}' ssh -o StrictHostKeyChecking=no -o ConnectTimeout=10 {KALI_USER}@{KALI_HOST} "sqlite3 -json '{KALI_DB}' \\"{query}\\"" """
-        
-        try:
-            result = subprocess.run(
-                cmd, shell=True, capture_output=True, text=True, timeout=30
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                return json.loads(result.stdout)
-            return []
-        except Exception as e:
-            print(f"Kali query error: {e}")
-            return []
+    @property
+    def mirror(self) -> OSINTMirror:
+        """Local mirror of the Kali database, created on first use."""
+        if self._mirror is None:
+            self._mirror = OSINTMirror()
+        return self._mirror
     
     def collect(self, date_from: datetime = None, date_to: datetime = None, days_back: int = 1) -> List[Dict[str, Any]]:
-        """Collect OSINT signals from Kali"""
+        """
+        Collect OSINT signals from Kali.
+
+        Items scraped after date_from are returned; without date_from the
+        window is the last days_back days. The local mirror is synced first;
+        if the Kali box is unreachable the rows already mirrored are used.
+        """
         signals = []
-        cutoff = (datetime.now(timezone.utc) - timedelta(days=days_back)).isoformat()
+        try:
+            self.mirror.sync()
+        except Exception as e:
+            logger.warning(f"OSINT mirror sync failed, using local copy: {e}")
+        
+        if date_from is not None:
+            cutoff = date_from.astimezone(timezone.utc).isoformat()
+        else:
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=days_back)).isoformat()
         
         # Collect Reddit posts
-        reddit_query = f"""
+        reddit_query = """
             SELECT id, subreddit, title, selftext, author, score, 
-                   num_comments, url, created_utc, keywords_matched
+                   num_comments, url, created_utc, keywords_matched, scraped_at
             FROM reddit_posts 
-            WHERE scraped_at > '{cutoff}'
+            WHERE scraped_at > ?
             AND keywords_matched IS NOT NULL
             ORDER BY score DESC
             LIMIT 200
         """
         
-        reddit_posts = self._run_kali_query(reddit_query)
+        reddit_posts = self.mirror.query(reddit_query, (self._table_cutoff('reddit_posts', cutoff),))
+        self._stage_table_watermark('reddit_posts', reddit_posts, 200)
         for post in reddit_posts:
             signals.append(self._reddit_to_signal(post))
         
         # Collect news items
-        news_query = f"""
-            SELECT id, feed, title, summary, link, published, keywords_matched
+        news_query = """
+            SELECT id, feed, title, summary, link, published, keywords_matched, scraped_at
             FROM news_items 
-            WHERE scraped_at > '{cutoff}'
+            WHERE scraped_at > ?
             AND keywords_matched IS NOT NULL
             ORDER BY published DESC
             LIMIT 200
         """
         
-        news_items = self._run_kali_query(news_query)
+        news_items = self.mirror.query(news_query, (self._table_cutoff('news_items', cutoff),))
+        self._stage_table_watermark('news_items', news_items, 200)
         for item in news_items:
             signals.append(self._news_to_signal(item))
         
         # Collect darkweb/private items
-        darkweb_query = f"""
-            SELECT id, source, title, content, url, keywords_matched
+        darkweb_query = """
+            SELECT id, source, title, content, url, keywords_matched, scraped_at
             FROM darkweb_items 
-            WHERE scraped_at > '{cutoff}'
+            WHERE scraped_at > ?
             ORDER BY scraped_at DESC
             LIMIT 100
         """
         
-        darkweb_items = self._run_kali_query(darkweb_query)
+        darkweb_items = self.mirror.query(darkweb_query, (self._table_cutoff('darkweb_items', cutoff),))
+        self._stage_table_watermark('darkweb_items', darkweb_items, 100)
         for item in darkweb_items:
             signals.append(self._darkweb_to_signal(item))
         
         print(f"OSINT: {len(reddit_posts)} Reddit + {len(news_items)} news + {len(darkweb_items)} darkweb = {len(signals)} signals")
         return signals
     
+    def _table_cutoff(self, table: str, cutoff: str) -> str:
+        """Later of the window cutoff and the table's scraped_at watermark."""
+        mark = self._watermark(table)
+        if mark and mark.get('last_date') and mark['last_date'] > cutoff:
+            return mark['last_date']
+        return cutoff
+    
+    def _stage_table_watermark(self, table: str, rows: list, limit: int) -> None:
+        """Advance a table's watermark to the newest scraped_at returned."""
+        if not rows:
+            return
+        if len(rows) >= limit:
+            # Truncated result: rows beyond the limit may be older than the
+            # newest one returned, so keep the old mark and re-read next run
+            return
+        newest = max(rows, key=lambda r: r.get('scraped_at') or '')
+        if newest.get('scraped_at'):
+            self._stage_watermark(table, newest['scraped_at'], str(newest.get('id', '')))
+    
     def _reddit_to_signal(self, post: dict) -> Dict[str, Any]:
         """Convert Reddit post to standardized signal dict"""
         subreddit = post.get("subreddit", "unknown")
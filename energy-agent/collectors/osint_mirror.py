@@ -0,0 +1,252 @@
+"""
+Local mirror of the Kali OSINT scraper database.
+
+The scraper on the Kali box writes Reddit posts, news items and darkweb items
+into its own SQLite file. Rather than querying it over SSH on every run, the
+mirror pulls only rows scraped since the newest one it already holds and keeps
+them in a local SQLite file, which the OSINT collector then queries directly.
+
+Where rows come from is pluggable: `KaliSSHSource` reads the remote database
+over SSH, and `SQLiteSource` reads any local file with the same schema, e.g. a
+copy of the scraper database in tests.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+import json
+import logging
+import os
+import shlex
+import sqlite3
+import subprocess
+import threading
+
+from config.settings import OSINT_MIRROR_PATH, OSINT_MIRROR_INITIAL_DAYS, OSINT_SYNC_BATCH
+
+logger = logging.getLogger(__name__)
+
+# Kali box connection
+KALI_HOST = "192.168.154.193"
+KALI_USER = "oc"
+KALI_PASS = "Apple24"
+KALI_DB = "/home/oc/energy-osint/data/osint.db"
+
+# Mirrored tables and the columns copied from each
+MIRROR_TABLES = {
+    'reddit_posts': [
+        'id', 'subreddit', 'title', 'selftext', 'author', 'score',
+        'num_comments', 'url', 'created_utc', 'keywords_matched', 'scraped_at'
+    ],
+    'news_items': [
+        'id', 'feed', 'title', 'summary', 'link', 'published', 'keywords_matched', 'scraped_at'
+    ],
+    'darkweb_items': [
+        'id', 'source', 'title', 'content', 'url', 'keywords_matched', 'scraped_at'
+    ],
+}
+
+# Line printed before each table's rows in a batched remote script
+TABLE_MARKER = '#table '
+
+
+def select_since(table: str, columns: List[str], since: str, limit: str) -> str:
+    """Query for a table's rows scraped at or after a cutoff, oldest first."""
+    return (
+        f"SELECT {', '.join(columns)} FROM {table} "
+        f"WHERE scraped_at >= {since} ORDER BY scraped_at ASC LIMIT {limit}"
+    )
+
+
+class SQLiteSource:
+    """Reads scraper rows from a SQLite file on this machine."""
+
+    def __init__(self, db_path: str):
+        self.db_path = str(db_path)
+
+    def fetch_batch(self, requests: List[Tuple[str, List[str], str, int]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Run one query per (table, columns, since, limit) request.
+
+        Yields (table, row) pairs as they are read, each table's rows having
+        scraped_at >= since, oldest first, at most limit of them.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            for table, columns, since, limit in requests:
+                for row in conn.execute(select_since(table, columns, '?', '?'), (since, limit)):
+                    yield table, dict(row)
+
+
+class KaliSSHSource:
+    """
+    Reads scraper rows from the Kali box over SSH.
+
+    A batch of queries goes to the remote sqlite3 shell as a single script
+    on stdin, so one SSH session serves every table. Cutoffs and limits are
+    bound with `.parameter set` rather than pasted into the SQL, and rows are
+    parsed line by line while the remote shell is still writing them.
+    Connections are multiplexed through an SSH control socket, so follow-up
+    batches within ControlPersist reuse the open connection.
+    """
+
+    def __init__(self, host: str = KALI_HOST, user: str = KALI_USER,
+                 password: str = KALI_PASS, db_path: str = KALI_DB, timeout: int = 120):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.db_path = db_path
+        self.timeout = timeout
+
+    def fetch_batch(self, requests: List[Tuple[str, List[str], str, int]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Run one query per (table, columns, since, limit) request in one session.
+
+        Yields (table, row) pairs as they arrive, each table's rows having
+        scraped_at >= since, oldest first, at most limit of them.
+        """
+        proc = subprocess.Popen(
+            self._command(), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE, text=True, env={**os.environ, 'SSHPASS': self.password}
+        )
+        watchdog = threading.Timer(self.timeout, proc.kill)
+        watchdog.start()
+        try:
+            proc.stdin.write(self._script(requests))
+            proc.stdin.close()
+
+            table = None
+            for line in proc.stdout:
+                line = line.strip()
+                if line.startswith(TABLE_MARKER):
+                    table = line[len(TABLE_MARKER):].strip()
+                    continue
+                row = line.lstrip('[').rstrip(',]')
+                if table and row:
+                    yield table, json.loads(row)
+
+            stderr = proc.stderr.read()
+            if proc.wait() != 0:
+                raise RuntimeError(f"Kali query failed ({proc.returncode}): {stderr.strip()}")
+        finally:
+            watchdog.cancel()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+    def _command(self) -> List[str]:
+        """ssh invocation running the remote sqlite3 shell in JSON mode."""
+        return [
+            'sshpass', '-e', 'ssh',
+            '-o', 'StrictHostKeyChecking=no',
+            '-o', 'ConnectTimeout=10',
+            '-o', 'ControlMaster=auto',
+            '-o', 'ControlPath=~/.ssh/cm-%r@%h:%p',
+            '-o', 'ControlPersist=60',
+            f'{self.user}@{self.host}',
+            'sqlite3', '-json', shlex.quote(self.db_path),
+        ]
+
+    @staticmethod
+    def _script(requests: List[Tuple[str, List[str], str, int]]) -> str:
+        """sqlite3 shell script binding each request's parameters and marking its output."""
+        lines = ['.bail on']
+        for i, (table, columns, since, limit) in enumerate(requests):
+            # The shell evaluates a parameter value as SQL, so quote text as a literal
+            literal = "'" + since.replace("'", "''") + "'"
+            literal = literal.replace('\\', '\\\\').replace('"', '\\"')
+            lines += [
+                f'.parameter set @since{i} "{literal}"',
+                f'.parameter set @limit{i} {int(limit)}',
+                f'.print {TABLE_MARKER}{table}',
+                select_since(table, columns, f'@since{i}', f'@limit{i}') + ';',
+            ]
+        return '\n'.join(lines) + '\n'
+
+
+class OSINTMirror:
+    """Incrementally synced local copy of the scraper tables."""
+
+    def __init__(self, db_path: str = None, source=None, batch_size: int = None):
+        """
+        Args:
+            db_path: Mirror file (default: OSINT_MIRROR_PATH)
+            source: Where rows come from (default: KaliSSHSource)
+            batch_size: Rows fetched per round trip
+        """
+        self.db_path = str(db_path or OSINT_MIRROR_PATH)
+        self.source = source if source is not None else KaliSSHSource()
+        self.batch_size = batch_size or OSINT_SYNC_BATCH
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self):
+        """Create the mirrored tables."""
+        with sqlite3.connect(self.db_path) as conn:
+            for table, columns in MIRROR_TABLES.items():
+                rest = ', '.join(c for c in columns if c != 'id')
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (id PRIMARY KEY, {rest})")
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_scraped ON {table}(scraped_at)")
+            conn.commit()
+
+    def newest_scraped_at(self, table: str) -> Optional[str]:
+        """Latest scraped_at held locally for a table, or None if empty."""
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(f"SELECT MAX(scraped_at) FROM {table}").fetchone()[0]
+
+    def sync(self) -> Dict[str, int]:
+        """
+        Pull rows scraped since the last sync for every mirrored table.
+
+        Each round asks the source for the next batch of every table that
+        still has rows pending, in a single request, and writes rows as they
+        stream in. Batches are read oldest first and re-read the boundary
+        timestamp so rows sharing it are never skipped; re-read rows simply
+        replace their local copy. An empty mirror starts
+        OSINT_MIRROR_INITIAL_DAYS back.
+
+        Returns:
+            Dict of table -> rows received
+        """
+        counts = {table: 0 for table in MIRROR_TABLES}
+        with self._lock:
+            initial = (datetime.now(timezone.utc) - timedelta(days=OSINT_MIRROR_INITIAL_DAYS)).isoformat()
+            pending = {table: self.newest_scraped_at(table) or initial for table in MIRROR_TABLES}
+            while pending:
+                received, newest = self._sync_round(pending)
+                for table, since in list(pending.items()):
+                    counts[table] += received[table]
+                    if received[table] < self.batch_size:
+                        del pending[table]
+                    elif newest[table] <= since:
+                        # A whole batch shares one timestamp; nothing more can
+                        # be paged past it without a tie-breaker
+                        logger.warning(f"{table}: more than {self.batch_size} rows scraped at {since}")
+                        del pending[table]
+                    else:
+                        pending[table] = newest[table]
+        logger.info(f"OSINT mirror synced: {counts}")
+        return counts
+
+    def _sync_round(self, pending: Dict[str, str]):
+        """Fetch one batch per pending table. Returns per-table row counts and newest scraped_at."""
+        requests = [(table, MIRROR_TABLES[table], since, self.batch_size) for table, since in pending.items()]
+        inserts = {
+            table: f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+                   f"VALUES ({', '.join('?' for _ in columns)})"
+            for table, columns in MIRROR_TABLES.items()
+        }
+        received = {table: 0 for table in pending}
+        newest = dict(pending)
+
+        with sqlite3.connect(self.db_path) as conn:
+            for table, row in self.source.fetch_batch(requests):
+                conn.execute(inserts[table], tuple(row.get(c) for c in MIRROR_TABLES[table]))
+                received[table] += 1
+                newest[table] = max(newest[table], row.get('scraped_at') or '')
+            conn.commit()
+        return received, newest
+
+    def query(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        """Run a read query against the mirror."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(sql, params).fetchall()]
@@ -0,0 +1,126 @@
+"""
+Per-host token-bucket rate limiting shared by all collectors.
+
+Each host gets a bucket that refills at its allowed request rate and holds up
+to a burst's worth of tokens. Callers reserve a token before every request and
+only wait when the bucket is empty, so a request that already took longer than
+the refill interval goes straight through instead of sleeping a fixed delay.
+
+Buckets are guarded by a lock, so one limiter can be shared between threads;
+coroutines can use `acquire_async`, which reserves the same way and then
+awaits the wait instead of blocking the event loop.
+"""
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+import asyncio
+import threading
+import time
+
+from config.settings import HOST_RATE_LIMITS
+
+
+class TokenBucket:
+    """Thread-safe token bucket."""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        """
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum tokens held (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Take tokens from the bucket.
+
+        The bucket may go into debt, which queues concurrent callers in order.
+
+        Returns:
+            Seconds the caller must wait before using the reserved tokens
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Block until tokens are available. Returns the time waited."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1) -> float:
+        """Coroutine version of acquire()."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """Registry of token buckets keyed by host."""
+
+    def __init__(self, limits: Dict[str, Tuple[float, float]] = None):
+        """
+        Args:
+            limits: host suffix -> (requests per second, burst size)
+        """
+        self.limits = dict(HOST_RATE_LIMITS if limits is None else limits)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, url: str) -> Optional[TokenBucket]:
+        """Return the bucket governing a URL, or None if its host is unlimited."""
+        host = urlparse(url).hostname or url
+        key = self._match(host)
+        if key is None:
+            return None
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                rate, capacity = self.limits[key]
+                bucket = TokenBucket(rate, capacity)
+                self._buckets[key] = bucket
+            return bucket
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to this URL is allowed. Returns the time waited."""
+        bucket = self.bucket_for(url)
+        return bucket.acquire() if bucket else 0.0
+
+    async def acquire_async(self, url: str) -> float:
+        """Coroutine version of acquire()."""
+        bucket = self.bucket_for(url)
+        return await bucket.acquire_async() if bucket else 0.0
+
+    def _match(self, host: str) -> Optional[str]:
+        """Find the most specific configured suffix for a host."""
+        parts = host.lower().split('.')
+        for i in range(len(parts)):
+            candidate = '.'.join(parts[i:])
+            if candidate in self.limits:
+                return candidate
+        return None
+
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter shared by all collectors."""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+        return _shared_limiter
@@ -13,15 +13,14 @@ Relevant forms:
 API docs: https://www.sec.gov/search-filings/edgar-search-assistance
 Full-text search: https://efts.sec.gov/LATEST/search-index
 """
-import requests
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import logging
-import time
 import re
 
 from .base import BaseCollector
 from config.settings import TECHNOLOGY_KEYWORDS, TIER_1_COMPANIES, TIER_2_COMPANIES
+from scoring.features import get_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -59,11 +58,14 @@ COMPANY_CIKS = {
 class SECCollector(BaseCollector):
     """Collector for SEC EDGAR filings."""
     
+    # SEC allows 10 req/sec, so keep several queries in flight
+    max_concurrency = 4
+    
     def __init__(self):
         super().__init__('sec')
         self.search_url = "https://efts.sec.gov/LATEST/search-index"
         self.filings_url = "https://data.sec.gov/submissions"
-        self.rate_limit_delay = 0.5  # SEC asks for 10 req/sec max
+        self.page_size = 100  # Full-text search returns at most 100 hits per request
         
         # Required by SEC: identify yourself
         self.headers = {
@@ -121,86 +123,72 @@ class SECCollector(BaseCollector):
             'hydrogen AND (production OR fuel)',
         ]
         
-        all_results = []
-        
-        for term in search_terms:
-            try:
-                results = self._full_text_search(term, date_from, date_to)
-                all_results.extend(results)
-                time.sleep(self.rate_limit_delay)
-            except Exception as e:
-                logger.error(f"SEC search failed for '{term}': {e}")
+        def search(term):
+            since = self._since(term, date_from)
+            signals = self._full_text_search(term, since, date_to)
+            return self._advance_watermark(term, self._filter_new(term, signals, since, date_to))
         
-        return all_results
+        return self._map_queries(search, search_terms)
     
     def _full_text_search(self, query: str, date_from: datetime, date_to: datetime) -> List[Dict[str, Any]]:
-        """Execute full-text search on SEC EDGAR."""
+        """Execute full-text search on SEC EDGAR, paging through every hit in the date range."""
         
         # SEC full-text search API
         url = "https://efts.sec.gov/LATEST/search-index"
         
-        params = {
-            "q": query,
-            "dateRange": "custom",
-            "startdt": date_from.strftime('%Y-%m-%d'),
-            "enddt": date_to.strftime('%Y-%m-%d'),
-            "forms": "8-K,10-K,10-Q",  # Focus on material filings
-            "from": 0,
-            "size": 50
-        }
-        
-        try:
-            response = requests.get(url, params=params, headers=self.headers, timeout=30)
+        def fetch_page(offset: int, size: int) -> List[Dict[str, Any]]:
+            params = {
+                "q": query,
+                "dateRange": "custom",
+                "startdt": date_from.strftime('%Y-%m-%d'),
+                "enddt": date_to.strftime('%Y-%m-%d'),
+                "forms": "8-K,10-K,10-Q",  # Focus on material filings
+                "from": offset,
+                "size": size
+            }
+            
+            # Errors propagate: a failed page must not look like the end of results.
+            # SEC sometimes returns HTML error pages, which fail json() the same way.
+            response = self._get(url, params=params, headers=self.headers)
             response.raise_for_status()
-            data = response.json()
-        except requests.RequestException as e:
-            logger.error(f"SEC API error: {e}")
-            return []
-        except ValueError:
-            # SEC sometimes returns HTML error pages
-            logger.error("SEC returned non-JSON response")
-            return []
+            return response.json().get('hits', {}).get('hits', [])
         
-        hits = data.get('hits', {}).get('hits', [])
+        # Extract domain from search query
+        domain = self._infer_domain(query)
         signals = []
         
-        for hit in hits:
-            source = hit.get('_source', {})
-            filing_id = hit.get('_id', '')
-            
-            # Extract domain from search query
-            domain = self._infer_domain(query)
-            
-            signal = self._standardize_signal(
-                raw_data=source,
-                source_id=filing_id,
-                title=f"{source.get('form', 'Filing')} - {source.get('display_names', ['Unknown'])[0]}",
-                abstract=source.get('file_description', ''),
-                date=self._parse_date(source.get('file_date')),
-                url=f"https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&filenum={source.get('file_num', '')}",
-                entities=self._extract_entities(source)
-            )
-            signal['domain'] = domain
-            signal['form_type'] = source.get('form', '')
-            signal['company'] = source.get('display_names', ['Unknown'])[0]
-            
-            signals.append(signal)
+        for hits in self._paginate(fetch_page, page_size=self.page_size):
+            for hit in hits:
+                source = hit.get('_source', {})
+                filing_id = hit.get('_id', '')
+                
+                signal = self._standardize_signal(
+                    raw_data=source,
+                    source_id=filing_id,
+                    title=f"{source.get('form', 'Filing')} - {source.get('display_names', ['Unknown'])[0]}",
+                    abstract=source.get('file_description', ''),
+                    date=self._parse_date(source.get('file_date')),
+                    url=f"https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&filenum={source.get('file_num', '')}",
+                    entities=self._extract_entities(source)
+                )
+                signal['domain'] = domain
+                signal['form_type'] = source.get('form', '')
+                signal['company'] = source.get('display_names', ['Unknown'])[0]
+                
+                signals.append(signal)
         
         return signals
     
     def _check_watchlist(self, date_from: datetime, date_to: datetime) -> List[Dict[str, Any]]:
         """Check for new filings from watchlist companies."""
-        signals = []
+        def check(item):
+            company, cik = item
+            key = f"company:{company}"
+            since = self._since(key, date_from)
+            signals = self._get_company_filings(cik, company, since, date_to)
+            return self._advance_watermark(key, self._filter_new(key, signals, since, date_to))
         
-        for company, cik in COMPANY_CIKS.items():
-            try:
-                company_filings = self._get_company_filings(cik, company, date_from, date_to)
-                signals.extend(company_filings)
-                time.sleep(self.rate_limit_delay)
-            except Exception as e:
-                logger.warning(f"Failed to get filings for {company}: {e}")
-        
-        return signals
+        return self._map_queries(check, COMPANY_CIKS.items())
     
     def _get_company_filings(self, cik: str, company: str, date_from: datetime, date_to: datetime) -> List[Dict[str, Any]]:
         """Get recent filings for a specific company."""
@@ -209,13 +197,12 @@ class SECCollector(BaseCollector):
         cik_padded = cik.zfill(10)
         url = f"https://data.sec.gov/submissions/CIK{cik_padded}.json"
         
-        try:
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-        except requests.RequestException as e:
-            logger.error(f"Failed to fetch filings for CIK {cik}: {e}")
-            return []
+        # Submissions files are multi-megabyte and only change when the company
+        # files, so revalidate against the on-disk cache instead of re-downloading.
+        # Errors propagate so _map_queries logs and counts the failed query.
+        response = self._get(url, headers=self.headers, cache=True)
+        response.raise_for_status()
+        data = response.json()
         
         filings = data.get('filings', {}).get('recent', {})
         
@@ -283,11 +270,10 @@ class SECCollector(BaseCollector):
         entities['companies'] = names
         
         # Check tiers
+        matcher = get_matcher()
         for name in names:
-            for t1 in TIER_1_COMPANIES:
-                if t1.lower() in name.lower():
-                    entities['tier'] = 1
-                    break
+            if 'tier1' in matcher.scan(name):
+                entities['tier'] = 1
         
         return entities
     
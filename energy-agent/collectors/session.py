@@ -0,0 +1,58 @@
+"""
+Shared HTTP session layer for collectors.
+
+All collectors share one requests.Session so TCP/TLS connections are kept
+alive and reused per host. The session retries connection errors, 429s and
+5xx responses with exponential backoff, honouring Retry-After when the server
+sends it, and caps the number of pooled connections per host.
+"""
+from typing import Optional
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config.settings import (
+    HTTP_POOL_HOSTS, HTTP_POOL_MAXSIZE, HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_FACTOR, HTTP_RETRY_STATUSES
+)
+
+
+def build_session() -> requests.Session:
+    """Create a pooled session with retry/backoff configured."""
+    retry = Retry(
+        total=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        # Collector POSTs are read-only searches, so they are safe to retry
+        allowed_methods=frozenset(['GET', 'HEAD', 'POST']),
+        respect_retry_after_header=True,
+        # Hand the final response back so callers' raise_for_status() reports it
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_HOSTS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        pool_block=True,
+        max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+    return session
+
+
+_shared_session: Optional[requests.Session] = None
+_shared_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide session shared by all collectors."""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = build_session()
+        return _shared_session
@@ -9,7 +9,6 @@ import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import logging
-import time
 import os
 
 from .base import BaseCollector
@@ -21,11 +20,13 @@ logger = logging.getLogger(__name__)
 class USPTOCollector(BaseCollector):
     """Simplified USPTO patent collector - exact matches only."""
     
+    # Exact-match queries can't be restricted to a date window
+    supports_backfill = False
+    
     def __init__(self, api_key: str = None):
         super().__init__("uspto")
         self.base_url = "https://search.patentsview.org/api/v1/patent"
         self.api_key = api_key or os.getenv("PATENTSVIEW_API_KEY", "")
-        self.rate_limit_delay = 2.0
         
         # Exact company names (must match exactly in API)
         self.exact_companies = [
@@ -58,9 +59,10 @@ class USPTOCollector(BaseCollector):
         # Search each company (limit to first few to avoid rate limits)
         for company in self.exact_companies[:5]:
             try:
-                signals = self._collect_by_exact_company(company)
-                all_signals.extend(signals)
-                time.sleep(self.rate_limit_delay)
+                # No server-side date filter: drop patents at or before the watermark
+                since = self._since(company, None)
+                signals = self._filter_new(company, self._collect_by_exact_company(company), since)
+                all_signals.extend(self._advance_watermark(company, signals))
                 
                 if len(all_signals) >= 30:  # Limit total
                     break
@@ -105,11 +107,10 @@ class USPTOCollector(BaseCollector):
         }
         
         try:
-            response = requests.post(
+            response = self._post(
                 self.base_url,
                 headers=headers,
-                json=payload,
-                timeout=30
+                json=payload
             )
             response.raise_for_status()
             data = response.json()
@@ -12,6 +12,17 @@ LOGS_DIR = BASE_DIR / "logs"
 # Database
 DATABASE_PATH = DATA_DIR / "signals.db"
 
+# Applied to every signals database connection. WAL lets readers run while a
+# write commits; synchronous=NORMAL is durable under WAL except on power loss.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 30000,        # ms to wait for another process's write lock
+    'temp_store': 'MEMORY',
+    'cache_size': -64000,         # KiB (64 MB page cache)
+    'mmap_size': 268435456,       # 256 MB memory-mapped reads
+}
+
 # API Keys (from environment variables)
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 
@@ -27,11 +38,70 @@ USPTO_BASE_URL = "https://api.patentsview.org/patents/query"
 SEC_EDGAR_BASE = "https://efts.sec.gov/LATEST/search-index"
 ARXIV_API_BASE = "http://export.arxiv.org/api/query"
 
+# Per-host request budgets: host suffix -> (requests per second, burst size).
+# Hosts sharing a suffix (e.g. efts.sec.gov and data.sec.gov) share one bucket.
+HOST_RATE_LIMITS = {
+    'arxiv.org': (1 / 3.0, 1),        # ArXiv asks for 3 seconds between requests
+    'sec.gov': (10.0, 10),            # SEC fair-access policy: 10 req/sec max
+    'api.lens.org': (0.5, 2),
+    'patentsview.org': (0.5, 2),
+}
+
+# Shared HTTP session: pooled keep-alive connections with retry/backoff
+HTTP_TIMEOUT = 30             # Seconds per request
+HTTP_POOL_HOSTS = 10          # Number of per-host connection pools kept open
+HTTP_POOL_MAXSIZE = 8         # Max connections per host (requests block beyond this)
+HTTP_MAX_RETRIES = 4          # Retries on connection errors, 429 and 5xx
+HTTP_BACKOFF_FACTOR = 1.0     # Exponential backoff: 1s, 2s, 4s, ... (Retry-After wins)
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Pagination: most results fetched per query. Pages are requested until the
+# date window is exhausted or this cap is reached.
+MAX_RESULTS_PER_QUERY = {
+    'arxiv': 1000,
+    'sec': 500,
+    'lens_patent': 200,   # Lens free tier is 50 requests/month, 50 results each
+    'lens_scholar': 200,
+}
+DEFAULT_MAX_RESULTS = 500
+
+# On-disk HTTP response cache (conditional GETs via ETag/Last-Modified)
+HTTP_CACHE_DIR = DATA_DIR / "http_cache"
+HTTP_CACHE_MAX_BYTES = 512 * 1024 * 1024  # LRU-evicted beyond this size
+
+# Scored signals kept per day in the materialised top-N (get_top_signals)
+DAILY_TOP_N = 50
+
+# Columnar (Parquet) export of signals, scores and ratings for analytics
+EXPORT_DIR = DATA_DIR / "export"
+EXPORT_BATCH = 50000             # Rows read from SQLite per export batch
+
+# Local mirror of the Kali OSINT scraper database
+OSINT_MIRROR_PATH = DATA_DIR / "osint_mirror.db"
+OSINT_MIRROR_INITIAL_DAYS = 30   # History pulled on the first sync
+OSINT_SYNC_BATCH = 5000          # Rows fetched per remote round trip
+
 # Scoring thresholds
 SCORE_CRITICAL = 12  # SMS/WhatsApp alert
 SCORE_STRONG = 7     # Top 3 candidate
 SCORE_INTERESTING = 4  # Watch list
 
+# Convergence looks for other sources mentioning the same entity this far back
+CONVERGENCE_WINDOW_DAYS = 90
+
+# Backlogs larger than this are scored by a process pool, sharded by id range
+SCORING_PARALLEL_THRESHOLD = 2000
+SCORING_SHARD_SIZE = 1000      # Signals per shard (one read + one write transaction)
+SCORING_WORKERS = os.cpu_count() or 1
+
+# Base score components, each stored as its own column on scored_signals
+SCORE_COMPONENTS = ['convergence', 'government', 'capital', 'trl', 'player', 'ma_likelihood', 'impact', 'macro']
+
+# Preference learning from user ratings (1=down, 2=neutral, 3=up, 4=interesting, 5=excellent)
+PREFERENCE_RATING_REWARDS = {1: -1.0, 2: 0.0, 3: 0.5, 4: 0.75, 5: 1.0}
+PREFERENCE_PRIOR_SAMPLES = 5      # Pseudo-ratings of 'neutral' each weight starts from
+PREFERENCE_MAX_ADJUSTMENT = 0.5   # Learned weights stay within 1 ± this
+
 # Technology domains (from spec)
 TECHNOLOGY_KEYWORDS = {
     'cooling': [
@@ -96,3 +166,35 @@ TIER_2_COMPANIES = [
     'LiquidStack', 'Submer', 'Iceotope',
     'NREL', 'ORNL', 'Oak Ridge', 'Sandia', 'NPL', 'Fraunhofer'
 ]
+
+# Scoring keyword lists (matched on whole words, case-insensitive)
+GOVERNMENT_KEYWORDS = [
+    'inflation reduction act', 'ira', 'chips act', 'arpa-e',
+    'net zero', 'green deal', 'repowereu', 'doe grant',
+    'department of energy', 'nrc', 'nuclear regulatory',
+    'innovate uk', 'ukri', 'horizon europe'
+]
+
+# Sources that are government bodies themselves
+GOVERNMENT_SOURCES = ['doe', 'ukri', 'arpa-e', 'nrc']
+
+# Technology readiness level -> language typical of that stage
+TRL_KEYWORDS = {
+    7: ["field trial", "pilot", "commercial deployment", "customer validation", "production"],
+    6: ["demonstration", "prototype", "system test", "validated"],
+    5: ["component", "subsystem", "proof of concept"],
+}
+
+MA_KEYWORDS = ['license', 'partnership', 'collaboration', 'joint venture', 'acquisition']
+
+IMPACT_KEYWORDS = [
+    '10x', 'ten times', 'order of magnitude', 'breakthrough',
+    'revolutionary', 'novel', 'first', 'unprecedented',
+    'significantly improved', 'substantially reduced'
+]
+
+MACRO_KEYWORDS = [
+    'energy security', 'grid resilience', 'domestic supply',
+    'decarbonization', 'net zero', 'climate', 'carbon',
+    'supply chain', 'reshoring', 'critical minerals'
+]
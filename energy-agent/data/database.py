@@ -1,16 +1,161 @@
 """
 Database module for storing and retrieving signals.
 Uses SQLite for Phase 1 simplicity.
+
+Each SignalDatabase keeps one connection in WAL mode, shared by its methods
+under a lock. A forked child process opens its own connection on first use
+instead of reusing the parent's.
+
+_init_db() creates the baseline schema idempotently; later schema changes
+are numbered MIGRATIONS, applied once each and tracked in PRAGMA user_version.
 """
+from contextlib import contextmanager
 import sqlite3
 import json
+import os
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 import logging
 
+from config.settings import SCORE_COMPONENTS, SQLITE_PRAGMAS, DAILY_TOP_N
+
 logger = logging.getLogger(__name__)
 
+# SQL expression turning an ISO date into days since 1970-01-01
+EPOCH_DAY_SQL = "CAST(julianday({}) - 2440587.5 AS INTEGER)"
+
+# Month (YYYY-MM) a stored signal belongs to, for partitioned exports
+SIGNAL_MONTH_SQL = "COALESCE(substr(s.signal_date, 1, 7), substr(s.collected_at, 1, 7))"
+
+# Signal columns in the full-text index, and their BM25 weights
+FTS_COLUMNS = ['title', 'abstract', 'entities']
+FTS_WEIGHTS = [10.0, 1.0, 5.0]
+
+# Text values of an entities JSON, space-separated, so the index never sees its keys
+FTS_ENTITIES_SQL = (
+    "CASE WHEN json_valid({0}) THEN "
+    "(SELECT group_concat(value, ' ') FROM json_tree({0}) WHERE type = 'text') END"
+)
+
+# Columns written when a signal is stored (signal_day is derived from signal_date)
+SIGNAL_COLUMNS = ['source', 'source_id', 'title', 'abstract', 'signal_date', 'url', 'domain', 'raw_data', 'entities']
+
+
+def _drop_breakdown_json(cursor) -> None:
+    # The component columns replace the JSON breakdown; drop copies already migrated
+    cursor.execute("""
+        UPDATE scored_signals SET score_breakdown = NULL
+        WHERE score_breakdown IS NOT NULL AND convergence IS NOT NULL
+    """)
+
+
+def _add_covering_indexes(cursor) -> None:
+    # Date-window scans and score-ordered top-N, replacing the single-column indexes
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_signals_date_id ON signals(signal_date, id)")
+    cursor.execute("DROP INDEX IF EXISTS idx_signals_date")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_scored_final_signal
+        ON scored_signals(final_score DESC, signal_id)
+    """)
+    cursor.execute("DROP INDEX IF EXISTS idx_scored_final")
+
+
+def _add_is_scored(cursor) -> None:
+    # Flag maintained by triggers, so pending signals are found without an anti-join
+    cursor.execute("ALTER TABLE signals ADD COLUMN is_scored INTEGER NOT NULL DEFAULT 0")
+    cursor.execute("UPDATE signals SET is_scored = 1 WHERE id IN (SELECT signal_id FROM scored_signals)")
+    cursor.execute("""
+        CREATE INDEX idx_signals_pending ON signals(signal_date, id) WHERE is_scored = 0
+    """)
+    cursor.execute("""
+        CREATE TRIGGER scored_signals_flag_insert AFTER INSERT ON scored_signals BEGIN
+            UPDATE signals SET is_scored = 1 WHERE id = new.signal_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER scored_signals_flag_delete AFTER DELETE ON scored_signals BEGIN
+            UPDATE signals SET is_scored = 0 WHERE id = old.signal_id
+                AND NOT EXISTS (SELECT 1 FROM scored_signals WHERE signal_id = old.signal_id);
+        END
+    """)
+
+
+def _add_daily_top(cursor) -> None:
+    # Top scores per signal day; days whose scores change are queued for refresh
+    cursor.execute("""
+        CREATE TABLE daily_top_signals (
+            day TEXT NOT NULL,
+            rank INTEGER NOT NULL,
+            signal_id INTEGER NOT NULL,
+            final_score REAL,
+            PRIMARY KEY(day, rank)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE TABLE daily_top_stale (day TEXT PRIMARY KEY) WITHOUT ROWID")
+    for event, row in (('INSERT', 'new'), ('DELETE', 'old'), ('UPDATE OF final_score', 'new')):
+        name = event.split()[0].lower()
+        cursor.execute(f"""
+            CREATE TRIGGER daily_top_stale_{name} AFTER {event} ON scored_signals BEGIN
+                INSERT OR IGNORE INTO daily_top_stale (day)
+                SELECT signal_date FROM signals WHERE id = {row}.signal_id AND signal_date IS NOT NULL;
+            END
+        """)
+    cursor.execute("""
+        INSERT OR IGNORE INTO daily_top_stale (day)
+        SELECT DISTINCT signal_date FROM signals WHERE signal_date IS NOT NULL
+    """)
+
+
+def _index_entity_values(cursor) -> None:
+    # Full-text index over signal text, kept in sync by triggers. Its content is
+    # a view exposing entity values only; replaces an index over the raw JSON.
+    cursor.execute("DROP TRIGGER IF EXISTS signals_fts_insert")
+    cursor.execute("DROP TRIGGER IF EXISTS signals_fts_delete")
+    cursor.execute("DROP TRIGGER IF EXISTS signals_fts_update")
+    cursor.execute("DROP TABLE IF EXISTS signals_fts")
+    cursor.execute(f"""
+        CREATE VIEW signals_fts_content AS
+        SELECT id, title, abstract, {FTS_ENTITIES_SQL.format('entities')} AS entities FROM signals
+    """)
+    cursor.execute(f"""
+        CREATE VIRTUAL TABLE signals_fts USING fts5(
+            {', '.join(FTS_COLUMNS)}, content='signals_fts_content', content_rowid='id'
+        )
+    """)
+    columns = ', '.join(FTS_COLUMNS)
+    new_values = f"new.title, new.abstract, {FTS_ENTITIES_SQL.format('new.entities')}"
+    old_values = f"old.title, old.abstract, {FTS_ENTITIES_SQL.format('old.entities')}"
+    cursor.execute(f"""
+        CREATE TRIGGER signals_fts_insert AFTER INSERT ON signals BEGIN
+            INSERT INTO signals_fts (rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER signals_fts_delete AFTER DELETE ON signals BEGIN
+            INSERT INTO signals_fts (signals_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER signals_fts_update AFTER UPDATE OF {columns} ON signals BEGIN
+            INSERT INTO signals_fts (signals_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO signals_fts (rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    """)
+    # FTS5 'rebuild' can't read json_tree() through the view; index existing rows directly
+    cursor.execute(f"INSERT INTO signals_fts (rowid, {columns}) SELECT id, {columns} FROM signals_fts_content")
+
+
+# Schema migrations, in order: (user_version after applying, description, function(cursor))
+MIGRATIONS = [
+    (1, 'drop JSON breakdowns already stored as columns', _drop_breakdown_json),
+    (2, 'covering indexes for date windows and top scores', _add_covering_indexes),
+    (3, 'is_scored flag for pending signals', _add_is_scored),
+    (4, 'per-day top-N materialisation', _add_daily_top),
+    (5, 'full-text index over entity values, not raw JSON', _index_entity_values),
+]
+
 
 class SignalDatabase:
     """SQLite database for signal storage and retrieval."""
@@ -19,11 +164,48 @@ class SignalDatabase:
         if db_path is None:
             db_path = str(Path(__file__).resolve().parent / "signals.db")
         self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = os.getpid()
+        self._lock = threading.RLock()
         self._init_db()
     
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        The shared connection, held under the lock for the block.
+        
+        Commits when the block completes and rolls back if it raises, like
+        using a sqlite3 connection as a context manager.
+        """
+        if self._pid != os.getpid():
+            # Forked child: the parent's connection and lock are not ours to use.
+            # Keep the inherited handle referenced so it is never closed here.
+            self._inherited_conn = self._conn
+            self._conn = None
+            self._pid = os.getpid()
+            self._lock = threading.RLock()
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                for pragma, value in SQLITE_PRAGMAS.items():
+                    self._conn.execute(f"PRAGMA {pragma} = {value}")
+            try:
+                yield self._conn
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+    
+    def close(self) -> None:
+        """Close the shared connection; it is reopened on next use."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+    
     def _init_db(self):
         """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
             
             # Signals table - raw collected data
@@ -93,160 +275,781 @@ class SignalDatabase:
                 )
             """)
             
+            # Running rating totals behind each learned weight
+            self._add_missing_columns(cursor, 'user_preferences', {'reward_sum': 'REAL DEFAULT 0'})
+            
+            # Preference learning position: bumped on every weight change
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS preference_state (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER DEFAULT 0,
+                    last_rating_id INTEGER DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            cursor.execute("INSERT OR IGNORE INTO preference_state (id) VALUES (1)")
+            
+            # Collection watermarks: newest item seen per collector and query domain
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS collection_state (
+                    collector TEXT NOT NULL,
+                    domain TEXT NOT NULL,
+                    last_date TEXT,  -- ISO date (or timestamp) of the newest item seen
+                    last_source_id TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY(collector, domain)
+                )
+            """)
+            
+            # Backfill checkpoints: one row per collector and date chunk
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS backfill_progress (
+                    collector TEXT NOT NULL,
+                    chunk_start DATE NOT NULL,
+                    chunk_end DATE NOT NULL,
+                    status TEXT,  -- 'done', 'failed'
+                    signal_count INTEGER DEFAULT 0,
+                    error TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY(collector, chunk_start, chunk_end)
+                )
+            """)
+            
+            # Signal date as days since 1970-01-01, set once at ingestion
+            if self._add_missing_columns(cursor, 'signals', {'signal_day': 'INTEGER'}):
+                cursor.execute(f"UPDATE signals SET signal_day = {EPOCH_DAY_SQL.format('signal_date')}")
+            
+            # Entity mentions of stored signals inside the convergence window
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS entity_mentions (
+                    entity_type TEXT NOT NULL,  -- 'companies', 'technologies'
+                    entity TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    source_id TEXT NOT NULL,
+                    signal_id INTEGER NOT NULL,
+                    signal_day INTEGER NOT NULL,  -- days since 1970-01-01
+                    PRIMARY KEY(entity_type, entity, signal_id)
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_mentions_day ON entity_mentions(signal_day)")
+            
+            # Mentions per entity and source in the window, maintained by triggers
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS entity_window_counts (
+                    entity_type TEXT NOT NULL,
+                    entity TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    mentions INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY(entity_type, entity, source)
+                )
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_mentions_insert AFTER INSERT ON entity_mentions
+                BEGIN
+                    INSERT INTO entity_window_counts (entity_type, entity, source, mentions)
+                    VALUES (NEW.entity_type, NEW.entity, NEW.source, 1)
+                    ON CONFLICT(entity_type, entity, source) DO UPDATE SET mentions = mentions + 1;
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_mentions_delete AFTER DELETE ON entity_mentions
+                BEGIN
+                    UPDATE entity_window_counts SET mentions = mentions - 1
+                    WHERE entity_type = OLD.entity_type AND entity = OLD.entity AND source = OLD.source;
+                    DELETE FROM entity_window_counts
+                    WHERE entity_type = OLD.entity_type AND entity = OLD.entity AND source = OLD.source
+                      AND mentions <= 0;
+                END
+            """)
+            
+            # Window position: first day covered and last signal indexed
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS entity_window_state (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    start_day INTEGER,
+                    last_signal_id INTEGER DEFAULT 0
+                )
+            """)
+            
+            # Per-component points, so scores can be recombined without rescoring
+            added = self._add_missing_columns(cursor, 'scored_signals', {
+                **{name: 'REAL' for name in SCORE_COMPONENTS},
+                'preference': 'REAL DEFAULT 1.0',
+                'category': 'TEXT'
+            })
+            if 'convergence' in added:
+                # Fill the new columns for scores saved before they existed
+                assignments = ', '.join(
+                    f"{name} = json_extract(score_breakdown, '$.{name}')" for name in SCORE_COMPONENTS
+                )
+                cursor.execute(f"""
+                    UPDATE scored_signals SET {assignments},
+                        preference = COALESCE(json_extract(score_breakdown, '$.preference_adjustment'), 1.0)
+                    WHERE score_breakdown IS NOT NULL
+                """)
+            
             # Create indexes
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_signals_date ON signals(signal_date)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_signals_source ON signals(source)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_signals_domain ON signals(domain)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_scored_final ON scored_signals(final_score)")
             
             conn.commit()
+            self._migrate(conn)
+    
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Apply every migration newer than the database's user_version, each in its own transaction."""
+        for version, description, migration in MIGRATIONS:
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                continue
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Another process may have migrated while we waited for the lock
+                if conn.execute("PRAGMA user_version").fetchone()[0] < version:
+                    migration(conn.cursor())
+                    conn.execute(f"PRAGMA user_version = {version}")
+                    logger.info(f"Applied database migration {version}: {description}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    
+    def _add_missing_columns(self, cursor, table: str, columns: Dict[str, str]) -> List[str]:
+        """Add any of the given columns (name -> declaration) a table lacks. Returns those added."""
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        added = []
+        for name, declaration in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declaration}")
+                added.append(name)
+        return added
+    
+    @staticmethod
+    def _signal_row(signal: Dict[str, Any]) -> tuple:
+        """Column values of a signal, in SIGNAL_COLUMNS order."""
+        return (
+            signal['source'],
+            signal['source_id'],
+            signal.get('title', ''),
+            signal.get('abstract', ''),
+            signal.get('date', datetime.now()).strftime('%Y-%m-%d') if signal.get('date') else None,
+            signal.get('url', ''),
+            signal.get('domain', ''),
+            json.dumps(signal.get('raw_data', {})),
+            json.dumps(signal.get('entities', {}))
+        )
     
     def insert_signal(self, signal: Dict[str, Any]) -> Optional[int]:
         """Insert a signal, returning its ID. Returns None if duplicate."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
             try:
-                cursor.execute("""
-                    INSERT INTO signals (source, source_id, title, abstract, signal_date, url, domain, raw_data, entities)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    signal['source'],
-                    signal['source_id'],
-                    signal.get('title', ''),
-                    signal.get('abstract', ''),
-                    signal.get('date', datetime.now()).strftime('%Y-%m-%d') if signal.get('date') else None,
-                    signal.get('url', ''),
-                    signal.get('domain', ''),
-                    json.dumps(signal.get('raw_data', {})),
-                    json.dumps(signal.get('entities', {}))
-                ))
-                conn.commit()
+                cursor.execute(f"""
+                    INSERT INTO signals ({', '.join(SIGNAL_COLUMNS)}, signal_day)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, {EPOCH_DAY_SQL.format('?5')})
+                """, self._signal_row(signal))
                 return cursor.lastrowid
             except sqlite3.IntegrityError:
                 # Duplicate signal
                 return None
     
     def insert_signals(self, signals: List[Dict[str, Any]]) -> int:
-        """Insert multiple signals using a single connection. Returns count of new signals inserted."""
-        count = 0
-        with sqlite3.connect(self.db_path) as conn:
+        """Insert multiple signals in one transaction. Returns count of new signals inserted."""
+        return self._merge_signals(signals)[1]
+    
+    def upsert_signals(self, signals: List[Dict[str, Any]]) -> Dict[Tuple[str, str], int]:
+        """
+        Insert new signals and look up the ones already stored, in one transaction.
+        
+        Returns:
+            (source, source_id) -> row id for every signal in the batch
+        """
+        return self._merge_signals(signals)[0]
+    
+    def _merge_signals(self, signals: List[Dict[str, Any]]) -> Tuple[Dict[Tuple[str, str], int], int]:
+        """
+        Stage a batch in a temp table and merge it into signals.
+        
+        Duplicates (already stored, or repeated within the batch) keep the
+        stored row; new rows get ids in batch order. Signals without a
+        source or source_id are skipped.
+        
+        Returns:
+            ((source, source_id) -> id, number of new rows)
+        """
+        columns = ', '.join(SIGNAL_COLUMNS)
+        with self._connection() as conn:
             cursor = conn.cursor()
-            for signal in signals:
-                try:
-                    cursor.execute("""
-                        INSERT INTO signals (source, source_id, title, abstract, signal_date, url, domain, raw_data, entities)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        signal["source"],
-                        signal["source_id"],
-                        signal.get("title", ""),
-                        signal.get("abstract", ""),
-                        signal.get("date", datetime.now()).strftime("%Y-%m-%d") if signal.get("date") else None,
-                        signal.get("url", ""),
-                        signal.get("domain", ""),
-                        json.dumps(signal.get("raw_data", {})),
-                        json.dumps(signal.get("entities", {}))
-                    ))
-                    count += 1
-                except sqlite3.IntegrityError:
-                    pass
-            conn.commit()
-        return count
+            cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS staged_signals ({columns})")
+            cursor.execute("DELETE FROM staged_signals")
+            cursor.executemany(f"""
+                INSERT INTO staged_signals ({columns})
+                VALUES ({', '.join('?' for _ in SIGNAL_COLUMNS)})
+            """, (self._signal_row(signal) for signal in signals))
+            
+            cursor.execute(f"""
+                INSERT INTO signals ({columns}, signal_day)
+                SELECT {columns}, {EPOCH_DAY_SQL.format('signal_date')}
+                FROM staged_signals st
+                WHERE source IS NOT NULL AND source_id IS NOT NULL
+                  AND NOT EXISTS (
+                      SELECT 1 FROM signals s WHERE s.source = st.source AND s.source_id = st.source_id
+                  )
+                ORDER BY rowid
+                ON CONFLICT(source, source_id) DO NOTHING
+            """)
+            new_count = cursor.rowcount
+            
+            cursor.execute("""
+                SELECT s.source, s.source_id, s.id
+                FROM signals s
+                JOIN (SELECT DISTINCT source, source_id FROM staged_signals) st
+                  ON s.source = st.source AND s.source_id = st.source_id
+            """)
+            ids = {(source, source_id): row_id for source, source_id, row_id in cursor.fetchall()}
+            cursor.execute("DELETE FROM staged_signals")
+        return ids, new_count
     
     def get_unscored_signals(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get signals that haven't been scored yet."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             cursor.execute("""
-                SELECT s.* FROM signals s
-                LEFT JOIN scored_signals ss ON s.id = ss.signal_id
-                WHERE ss.id IS NULL
-                ORDER BY s.signal_date DESC
+                SELECT * FROM signals
+                WHERE is_scored = 0
+                ORDER BY signal_date DESC
                 LIMIT ?
             """, (limit,))
             rows = cursor.fetchall()
             return [self._row_to_dict(row) for row in rows]
     
-    def get_top_signals(self, date_from: datetime = None, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get top scored signals."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+    def count_unscored(self) -> int:
+        """Number of signals that haven't been scored yet (counted on the pending index)."""
+        with self._connection() as conn:
             cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM signals WHERE is_scored = 0")
+            return cursor.fetchone()[0]
+    
+    def get_unscored_ids(self) -> List[int]:
+        """Ids of every signal that hasn't been scored yet, ascending."""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id FROM signals WHERE is_scored = 0 ORDER BY id")
+            return [row[0] for row in cursor.fetchall()]
+    
+    def get_unscored_signals_in_range(self, first_id: int, last_id: int) -> List[Dict[str, Any]]:
+        """Unscored signals with first_id <= id <= last_id."""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute("""
+                SELECT * FROM signals
+                WHERE id BETWEEN ? AND ? AND is_scored = 0
+                ORDER BY id
+            """, (first_id, last_id))
+            return [self._row_to_dict(row) for row in cursor.fetchall()]
+    
+    def search(self, query: str, date_from: datetime = None, domain: str = None,
+               limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Full-text search over signal titles, abstracts and entities.
+        
+        Args:
+            query: FTS5 query, e.g. 'HALEU', 'small modular reactor',
+                '"fuel cell" OR electrolyzer'; text that isn't valid query
+                syntax is searched as plain words
+            date_from: Only signals dated on or after this
+            domain: Only signals in this technology domain
+            limit: Maximum results
             
-            query = """
-                SELECT s.*, ss.final_score, ss.score_breakdown
+        Returns:
+            Signals ranked best first by BM25 (title matches weigh most),
+            with rank and final_score (None if unscored)
+        """
+        sql = f"""
+            SELECT s.*, bm25(signals_fts, {', '.join(str(w) for w in FTS_WEIGHTS)}) AS rank,
+                   ss.final_score
+            FROM signals_fts
+            JOIN signals s ON s.id = signals_fts.rowid
+            LEFT JOIN scored_signals ss ON ss.signal_id = s.id
+            WHERE signals_fts MATCH ?
+        """
+        params: List[Any] = []
+        if date_from:
+            sql += " AND s.signal_date >= ?"
+            params.append(date_from.strftime('%Y-%m-%d'))
+        if domain:
+            sql += " AND s.domain = ?"
+            params.append(domain)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            try:
+                cursor.execute(sql, [query] + params)
+            except sqlite3.OperationalError:
+                # Not valid FTS5 syntax (e.g. "X-energy"): match the words literally
+                words = ' '.join('"{}"'.format(word.replace('"', '""')) for word in query.split())
+                cursor.execute(sql, [words] + params)
+            return [self._row_to_dict(row) for row in cursor.fetchall()]
+    
+    def get_top_signals(self, date_from: datetime = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get top scored signals, with score components as plain columns.
+        
+        With a date_from and limit within DAILY_TOP_N, the answer is read
+        from the per-day top-N table (days with changed scores are refreshed
+        first), so the cost depends on the window, not the history.
+        """
+        columns = f"""
+            s.*, ss.base_score, ss.attention_score, ss.final_score,
+            {', '.join(f'ss.{name}' for name in SCORE_COMPONENTS)}, ss.preference, ss.category
+        """
+        if date_from and limit <= DAILY_TOP_N:
+            self.refresh_daily_top()
+            query = f"""
+                SELECT {columns}
+                FROM daily_top_signals t
+                JOIN signals s ON s.id = t.signal_id
+                JOIN scored_signals ss ON ss.signal_id = t.signal_id
+                WHERE t.day >= ?
+                ORDER BY t.final_score DESC LIMIT ?
+            """
+            params = [date_from.strftime('%Y-%m-%d'), limit]
+        else:
+            query = f"""
+                SELECT {columns}
                 FROM signals s
                 JOIN scored_signals ss ON s.id = ss.signal_id
             """
             params = []
-            
             if date_from:
                 query += " WHERE s.signal_date >= ?"
                 params.append(date_from.strftime('%Y-%m-%d'))
-            
             query += " ORDER BY ss.final_score DESC LIMIT ?"
             params.append(limit)
-            
+        
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             cursor.execute(query, params)
             rows = cursor.fetchall()
             return [self._row_to_dict(row) for row in rows]
     
+    def refresh_daily_top(self, full: bool = False) -> int:
+        """
+        Recompute the per-day top-N for days whose scores changed.
+        
+        Args:
+            full: Recompute every day, not only the changed ones
+        
+        Returns:
+            Number of days refreshed
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            if full:
+                cursor.execute("""
+                    INSERT OR IGNORE INTO daily_top_stale (day)
+                    SELECT DISTINCT signal_date FROM signals WHERE signal_date IS NOT NULL
+                """)
+            cursor.execute("SELECT day FROM daily_top_stale")
+            days = [row[0] for row in cursor.fetchall()]
+            for day in days:
+                cursor.execute("DELETE FROM daily_top_signals WHERE day = ?", (day,))
+                cursor.execute("""
+                    INSERT INTO daily_top_signals (day, rank, signal_id, final_score)
+                    SELECT ?, ROW_NUMBER() OVER (ORDER BY ss.final_score DESC, s.id), s.id, ss.final_score
+                    FROM signals s
+                    JOIN scored_signals ss ON ss.signal_id = s.id
+                    WHERE s.signal_date = ?
+                    ORDER BY ss.final_score DESC, s.id
+                    LIMIT ?
+                """, (day, day, DAILY_TOP_N))
+                cursor.execute("DELETE FROM daily_top_stale WHERE day = ?", (day,))
+        return len(days)
+    
     def save_score(self, signal_id: int, base_score: float, attention_score: float, 
-                   final_score: float, breakdown: Dict) -> None:
-        """Save score for a signal."""
-        with sqlite3.connect(self.db_path) as conn:
+                   final_score: float, breakdown: Dict, category: str = None) -> None:
+        """
+        Save score for a signal.
+        
+        The breakdown is stored as one numeric column per score component
+        plus preference; it is not kept as JSON.
+        """
+        self.save_scores_bulk([(signal_id, {
+            'base_score': base_score,
+            'attention_score': attention_score,
+            'final_score': final_score,
+            'breakdown': breakdown,
+            'category': category
+        })])
+    
+    def save_scores_bulk(self, scores: Iterable[Tuple[int, Dict[str, Any]]]) -> int:
+        """
+        Save many scores in one transaction.
+        
+        Args:
+            scores: (signal_id, score result) pairs, results shaped like
+                ScoringEngine.score() output
+        
+        Returns:
+            Number of scores saved
+        """
+        rows = [
+            (signal_id, result['base_score'], result['attention_score'], result['final_score'],
+             *(result['breakdown'].get(name) for name in SCORE_COMPONENTS),
+             result['breakdown'].get('preference_adjustment', 1.0), result.get('category'))
+            for signal_id, result in scores
+        ]
+        with self._connection() as conn:
+            conn.executemany(f"""
+                INSERT OR REPLACE INTO scored_signals 
+                (signal_id, base_score, attention_score, final_score,
+                 {', '.join(SCORE_COMPONENTS)}, preference, category)
+                VALUES (?, ?, ?, ?, {', '.join('?' for _ in SCORE_COMPONENTS)}, ?, ?)
+            """, rows)
+        return len(rows)
+    
+    def get_score_components(self) -> Dict[str, List]:
+        """
+        Stored component points for every scored signal, as columns.
+        
+        Returns:
+            Dict with lists signal_id, domain, attention_score and one per
+            score component; scores saved without components are skipped
+        """
+        names = ['signal_id', 'domain', 'attention_score'] + SCORE_COMPONENTS
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT ss.signal_id, s.domain, COALESCE(ss.attention_score, 0),
+                       {', '.join(f'COALESCE(ss.{name}, 0)' for name in SCORE_COMPONENTS)}
+                FROM scored_signals ss
+                JOIN signals s ON s.id = ss.signal_id
+                WHERE ss.convergence IS NOT NULL
+            """)
+            rows = cursor.fetchall()
+        columns = list(zip(*rows)) if rows else [()] * len(names)
+        return {name: list(values) for name, values in zip(names, columns)}
+    
+    def update_final_scores(self, rows: Iterable[Tuple[float, float, str, float, int]]) -> None:
+        """Write recombined (base_score, final_score, category, preference, signal_id) rows."""
+        with self._connection() as conn:
+            conn.executemany("""
+                UPDATE scored_signals
+                SET base_score = ?, final_score = ?, category = ?, preference = ?
+                WHERE signal_id = ?
+            """, rows)
+    
+    def sync_entity_window(self, start_day: int) -> Dict[str, int]:
+        """
+        Move the convergence window to start at start_day (days since epoch).
+        
+        Mentions older than the window are evicted and signals stored since
+        the last sync are indexed, entirely inside SQLite. Moving the start
+        backwards rebuilds the window.
+        
+        Returns:
+            Dict with mentions 'added' and 'evicted'
+        """
+        signal_day = f"COALESCE(s.signal_day, {EPOCH_DAY_SQL.format('date(s.collected_at)')})"
+        with self._connection() as conn:
             cursor = conn.cursor()
+            cursor.execute("SELECT start_day, last_signal_id FROM entity_window_state WHERE id = 1")
+            row = cursor.fetchone()
+            last_id = row[1] if row else 0
+            if row is None or row[0] is None or start_day < row[0]:
+                cursor.execute("DELETE FROM entity_mentions")
+                last_id = 0
+            
+            cursor.execute("DELETE FROM entity_mentions WHERE signal_day < ?", (start_day,))
+            evicted = cursor.rowcount
+            
+            added = 0
+            for entity_type in ('companies', 'technologies'):
+                cursor.execute(f"""
+                    INSERT OR IGNORE INTO entity_mentions
+                    (entity_type, entity, source, source_id, signal_id, signal_day)
+                    SELECT ?, e.value, s.source, s.source_id, s.id, {signal_day}
+                    FROM signals s, json_each(s.entities, '$.{entity_type}') e
+                    WHERE s.id > ? AND e.type = 'text' AND e.value != ''
+                      AND {signal_day} >= ?
+                """, (entity_type, last_id, start_day))
+                added += cursor.rowcount
+            
             cursor.execute("""
-                INSERT OR REPLACE INTO scored_signals 
-                (signal_id, base_score, attention_score, final_score, score_breakdown)
-                VALUES (?, ?, ?, ?, ?)
-            """, (signal_id, base_score, attention_score, final_score, json.dumps(breakdown)))
-            conn.commit()
+                INSERT INTO entity_window_state (id, start_day, last_signal_id)
+                VALUES (1, ?, (SELECT COALESCE(MAX(id), 0) FROM signals))
+                ON CONFLICT(id) DO UPDATE SET
+                    start_day = excluded.start_day,
+                    last_signal_id = excluded.last_signal_id
+            """, (start_day,))
+        return {'added': added, 'evicted': evicted}
+    
+    def get_entity_window_counts(self) -> Dict[Tuple[str, str], Dict[str, int]]:
+        """Mentions in the convergence window: (entity_type, entity) -> source -> count."""
+        counts: Dict[Tuple[str, str], Dict[str, int]] = {}
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT entity_type, entity, source, mentions FROM entity_window_counts")
+            for entity_type, entity, source, mentions in cursor.fetchall():
+                counts.setdefault((entity_type, entity), {})[source] = mentions
+        return counts
+    
+    def get_entity_window_matches(self, entities: Iterable[Tuple[str, str]], exclude_source: str,
+                                  limit: int) -> List[Tuple[str, str]]:
+        """Distinct (source, source_id) of windowed signals from other sources mentioning any entity."""
+        entities = list(entities)
+        if not entities:
+            return []
+        clauses = ' OR '.join('(entity_type = ? AND entity = ?)' for _ in entities)
+        params = [value for entity in entities for value in entity]
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT DISTINCT source, source_id FROM entity_mentions
+                WHERE ({clauses}) AND source != ?
+                LIMIT ?
+            """, (*params, exclude_source, limit))
+            return cursor.fetchall()
+    
+    def get_preference_version(self) -> int:
+        """Version of the learned weights; changes whenever any weight does."""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT version FROM preference_state WHERE id = 1")
+            row = cursor.fetchone()
+            return row[0] if row else 0
+    
+    def get_all_preference_weights(self) -> Tuple[int, Dict[str, Dict[str, float]]]:
+        """Version and every learned weight (type -> key -> weight), read consistently."""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT version FROM preference_state WHERE id = 1")
+            row = cursor.fetchone()
+            cursor.execute("SELECT preference_type, preference_key, weight FROM user_preferences")
+            weights: Dict[str, Dict[str, float]] = {}
+            for preference_type, key, weight in cursor.fetchall():
+                weights.setdefault(preference_type, {})[key] = weight
+            return (row[0] if row else 0), weights
+    
+    def get_ratings_for_learning(self, limit: int = 10000) -> List[Dict[str, Any]]:
+        """
+        Ratings not yet learned from, oldest first, with the scored features
+        of the rated signal (None where the signal has no score).
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute("SELECT last_rating_id FROM preference_state WHERE id = 1")
+            row = cursor.fetchone()
+            last_rating_id = row[0] if row else 0
+            cursor.execute("""
+                SELECT r.id, r.rating, s.domain, ss.player, ss.trl, ss.attention_score
+                FROM user_ratings r
+                LEFT JOIN signals s ON s.id = r.signal_id
+                LEFT JOIN scored_signals ss ON ss.signal_id = r.signal_id
+                WHERE r.id > ?
+                ORDER BY r.id
+                LIMIT ?
+            """, (last_rating_id, limit))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def apply_preference_updates(self, updates: Dict[Tuple[str, str], Tuple[int, float]],
+                                 last_rating_id: int, baseline: Tuple[str, str],
+                                 prior_samples: float, max_adjustment: float) -> int:
+        """
+        Fold rating totals into the learned weights in one transaction.
+        
+        Each (type, key) gains (ratings, reward sum). The baseline entry holds
+        the totals over all ratings; every learned weight is then recomputed
+        as 1 + (reward_sum - sample_count * mean) / (sample_count + prior_samples),
+        where mean is the baseline's mean reward, clamped to 1 ± max_adjustment.
+        The learning position moves to last_rating_id and the version is bumped.
+        
+        Returns:
+            The new version
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO user_preferences (preference_type, preference_key, sample_count, reward_sum)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(preference_type, preference_key) DO UPDATE SET
+                    sample_count = user_preferences.sample_count + excluded.sample_count,
+                    reward_sum = COALESCE(user_preferences.reward_sum, 0) + excluded.reward_sum
+            """, [(t, k, n, total) for (t, k), (n, total) in updates.items()])
+            cursor.execute("""
+                UPDATE user_preferences
+                SET weight = MAX(:low, MIN(:high, 1.0 + (reward_sum - sample_count * COALESCE((
+                        SELECT reward_sum / sample_count FROM user_preferences
+                        WHERE preference_type = :type AND preference_key = :key AND sample_count > 0
+                    ), 0)) / (sample_count + :prior))),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE sample_count > 0 AND NOT (preference_type = :type AND preference_key = :key)
+            """, {'low': 1 - max_adjustment, 'high': 1 + max_adjustment, 'prior': prior_samples,
+                  'type': baseline[0], 'key': baseline[1]})
+            cursor.execute("""
+                UPDATE preference_state
+                SET version = version + 1, last_rating_id = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = 1
+            """, (last_rating_id,))
+            cursor.execute("SELECT version FROM preference_state WHERE id = 1")
+            version = cursor.fetchone()[0]
+            return version
     
     def save_rating(self, signal_id: int, rating: int, comment: str = None) -> None:
         """Save user rating for a signal."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO user_ratings (signal_id, rating, comment)
                 VALUES (?, ?, ?)
             """, (signal_id, rating, comment))
-            conn.commit()
     
-    def get_stats(self) -> Dict[str, Any]:
-        """Get database statistics."""
-        with sqlite3.connect(self.db_path) as conn:
+    def get_watermark(self, collector: str, domain: str) -> Optional[Dict[str, Any]]:
+        """Get the collection high-water mark for a collector/domain, if any."""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute("""
+                SELECT last_date, last_source_id, updated_at FROM collection_state
+                WHERE collector = ? AND domain = ?
+            """, (collector, domain))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+    
+    def set_watermark(self, collector: str, domain: str, last_date: str, last_source_id: str = None) -> None:
+        """Advance the high-water mark for a collector/domain. Never moves it backwards."""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO collection_state (collector, domain, last_date, last_source_id)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(collector, domain) DO UPDATE SET
+                    last_date = excluded.last_date,
+                    last_source_id = excluded.last_source_id,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE excluded.last_date >= collection_state.last_date
+                   OR collection_state.last_date IS NULL
+            """, (collector, domain, last_date, last_source_id))
+    
+    def get_completed_chunks(self, collector: str) -> set:
+        """Get (chunk_start, chunk_end) date strings already backfilled for a collector."""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT chunk_start, chunk_end FROM backfill_progress
+                WHERE collector = ? AND status = 'done'
+            """, (collector,))
+            return set(cursor.fetchall())
+    
+    def save_chunk_progress(self, collector: str, chunk_start: str, chunk_end: str, status: str,
+                            signal_count: int = 0, error: str = None) -> None:
+        """Record the outcome of a backfill chunk."""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO backfill_progress
+                (collector, chunk_start, chunk_end, status, signal_count, error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """, (collector, chunk_start, chunk_end, status, signal_count, error))
+    
+    def get_signals_after(self, after_id: int, limit: int = 50000) -> List[Dict[str, Any]]:
+        """Signals with id > after_id in id order, with their month (YYYY-MM)."""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute(f"""
+                SELECT s.*, {SIGNAL_MONTH_SQL} AS month FROM signals s
+                WHERE s.id > ? ORDER BY s.id LIMIT ?
+            """, (after_id, limit))
+            return [self._row_to_dict(row) for row in cursor.fetchall()]
+    
+    def get_scores_after(self, after_signal_id: int, limit: int = 50000) -> List[Dict[str, Any]]:
+        """Scores with signal_id > after_signal_id in signal order, with the signal's source and month."""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute(f"""
+                SELECT ss.signal_id, ss.base_score, ss.attention_score, ss.final_score,
+                       {', '.join(f'ss.{name}' for name in SCORE_COMPONENTS)}, ss.preference,
+                       ss.category, ss.scored_at, s.source, {SIGNAL_MONTH_SQL} AS month
+                FROM scored_signals ss
+                JOIN signals s ON s.id = ss.signal_id
+                WHERE ss.signal_id > ? ORDER BY ss.signal_id LIMIT ?
+            """, (after_signal_id, limit))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_ratings_after(self, after_id: int, limit: int = 50000) -> List[Dict[str, Any]]:
+        """Ratings with id > after_id in id order, with the rated signal's source and month."""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute(f"""
+                SELECT r.id, r.signal_id, r.rating, r.comment, r.rated_at,
+                       s.source, {SIGNAL_MONTH_SQL} AS month
+                FROM user_ratings r
+                LEFT JOIN signals s ON s.id = r.signal_id
+                WHERE r.id > ? ORDER BY r.id LIMIT ?
+            """, (after_id, limit))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_stats(self, date_from: datetime = None) -> Dict[str, Any]:
+        """
+        Get database statistics.
+        
+        Args:
+            date_from: Only count signals dated on or after this (default: all)
+        """
+        where = "WHERE s.signal_date >= ?" if date_from else ""
+        params = [date_from.strftime('%Y-%m-%d')] if date_from else []
+        with self._connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute("SELECT COUNT(*) FROM signals")
+            cursor.execute(f"SELECT COUNT(*) FROM signals s {where}", params)
             total_signals = cursor.fetchone()[0]
             
-            cursor.execute("SELECT COUNT(*) FROM scored_signals")
-            scored_signals = cursor.fetchone()[0]
+            cursor.execute(f"""
+                SELECT ss.category, COUNT(*) FROM scored_signals ss
+                JOIN signals s ON s.id = ss.signal_id {where}
+                GROUP BY ss.category
+            """, params)
+            by_category = {category or 'unknown': count for category, count in cursor.fetchall()}
             
-            cursor.execute("SELECT COUNT(*) FROM user_ratings")
+            cursor.execute(f"""
+                SELECT COUNT(*) FROM user_ratings r
+                JOIN signals s ON s.id = r.signal_id {where}
+            """ if date_from else "SELECT COUNT(*) FROM user_ratings", params)
             total_ratings = cursor.fetchone()[0]
             
-            cursor.execute("SELECT source, COUNT(*) FROM signals GROUP BY source")
+            cursor.execute(f"SELECT s.source, COUNT(*) FROM signals s {where} GROUP BY s.source", params)
             by_source = dict(cursor.fetchall())
             
-            cursor.execute("SELECT domain, COUNT(*) FROM signals WHERE domain IS NOT NULL GROUP BY domain")
+            cursor.execute(f"""
+                SELECT s.domain, COUNT(*) FROM signals s
+                WHERE s.domain IS NOT NULL {'AND s.signal_date >= ?' if date_from else ''}
+                GROUP BY s.domain
+            """, params)
             by_domain = dict(cursor.fetchall())
             
             return {
                 'total_signals': total_signals,
-                'scored_signals': scored_signals,
+                'scored_signals': sum(by_category.values()),
                 'total_ratings': total_ratings,
                 'by_source': by_source,
-                'by_domain': by_domain
+                'by_domain': by_domain,
+                'by_category': by_category
             }
     
     def _row_to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
         """Convert a database row to dictionary."""
         d = dict(row)
         # Parse JSON fields
-        for field in ['raw_data', 'entities', 'score_breakdown']:
+        for field in ['raw_data', 'entities']:
             if field in d and d[field]:
                 try:
                     d[field] = json.loads(d[field])
@@ -0,0 +1,288 @@
+"""
+Columnar export of the signal database for analytics.
+
+Writes signals, scores and ratings as Parquet files partitioned Hive-style by
+the signal's month and source:
+
+    export/signals/month=2025-06/source=arxiv/part-<first id>.parquet
+    export/scores/month=2025-06/source=arxiv/part-....parquet
+    export/ratings/month=2025-06/source=arxiv/part-....parquet
+
+Entity JSON is flattened: companies, technologies, authors and keywords
+become list columns, the numeric attention inputs become their own columns,
+and whatever else a collector stored stays in entities_extra (JSON).
+
+Signals and ratings are append-only, so each run only exports rows added
+since the last one (tracked in _export_state.json) as new part files. Scores
+change when signals are rescored, so the scores tree is rewritten on every
+run; it is numeric-only and cheap to rebuild.
+
+Read the result with e.g. pyarrow.dataset.dataset('export/signals',
+partitioning='hive') or pandas.read_parquet('export/signals').
+
+Requires pyarrow (optional dependency).
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Callable
+import json
+import logging
+import os
+import shutil
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import EXPORT_DIR, EXPORT_BATCH, SCORE_COMPONENTS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = '_export_state.json'
+
+# Entity fields exported as list columns
+ENTITY_LISTS = ('companies', 'technologies', 'authors', 'keywords')
+
+# Numeric entity fields exported as scalar columns
+ENTITY_NUMBERS = ('tier', 'reddit_score', 'num_comments', 'attention_multiplier')
+
+
+def signal_schema() -> 'pa.Schema':
+    return pa.schema(
+        [
+            ('id', pa.int64()),
+            ('source_id', pa.string()),
+            ('title', pa.string()),
+            ('abstract', pa.string()),
+            ('signal_date', pa.date32()),
+            ('signal_day', pa.int32()),
+            ('url', pa.string()),
+            ('domain', pa.string()),
+            ('collected_at', pa.timestamp('s')),
+        ]
+        + [(name, pa.list_(pa.string())) for name in ENTITY_LISTS]
+        + [
+            ('tier', pa.int8()),
+            ('reddit_score', pa.int64()),
+            ('num_comments', pa.int64()),
+            ('attention_multiplier', pa.float64()),
+            ('entities_extra', pa.string()),
+            ('raw_data', pa.string()),
+        ]
+    )
+
+
+def score_schema() -> 'pa.Schema':
+    return pa.schema(
+        [
+            ('signal_id', pa.int64()),
+            ('base_score', pa.float64()),
+            ('attention_score', pa.float64()),
+            ('final_score', pa.float64()),
+        ]
+        + [(name, pa.float64()) for name in SCORE_COMPONENTS]
+        + [
+            ('preference', pa.float64()),
+            ('category', pa.string()),
+            ('scored_at', pa.timestamp('s')),
+        ]
+    )
+
+
+def rating_schema() -> 'pa.Schema':
+    return pa.schema([
+        ('id', pa.int64()),
+        ('signal_id', pa.int64()),
+        ('rating', pa.int8()),
+        ('comment', pa.string()),
+        ('rated_at', pa.timestamp('s')),
+    ])
+
+
+def _parse_date(value: str):
+    return datetime.strptime(value[:10], '%Y-%m-%d').date() if value else None
+
+
+def _parse_timestamp(value: str):
+    return datetime.strptime(value[:19], '%Y-%m-%d %H:%M:%S') if value else None
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def signal_record(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a stored signal (as returned by the database) into export columns."""
+    entities = row.get('entities') if isinstance(row.get('entities'), dict) else {}
+    record = {
+        'id': row['id'],
+        'source_id': row['source_id'],
+        'title': row.get('title'),
+        'abstract': row.get('abstract'),
+        'signal_date': _parse_date(row.get('signal_date')),
+        'signal_day': row.get('signal_day'),
+        'url': row.get('url'),
+        'domain': row.get('domain') or None,
+        'collected_at': _parse_timestamp(row.get('collected_at')),
+    }
+    for name in ENTITY_LISTS:
+        values = entities.get(name)
+        record[name] = [str(v) for v in values if v] if isinstance(values, list) else None
+    for name in ENTITY_NUMBERS:
+        record[name] = _number(entities.get(name))
+    extra = {k: v for k, v in entities.items() if k not in ENTITY_LISTS and k not in ENTITY_NUMBERS}
+    record['entities_extra'] = json.dumps(extra) if extra else None
+    raw_data = row.get('raw_data')
+    record['raw_data'] = raw_data if isinstance(raw_data, str) else json.dumps(raw_data)
+    return record
+
+
+def score_record(row: Dict[str, Any]) -> Dict[str, Any]:
+    record = {name: row[name] for name in ['signal_id', 'base_score', 'attention_score', 'final_score']
+              + SCORE_COMPONENTS + ['preference', 'category']}
+    record['scored_at'] = _parse_timestamp(row.get('scored_at'))
+    return record
+
+
+def rating_record(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'id': row['id'],
+        'signal_id': row['signal_id'],
+        'rating': row['rating'],
+        'comment': row['comment'],
+        'rated_at': _parse_timestamp(row.get('rated_at')),
+    }
+
+
+def _partition_value(value: str) -> str:
+    """Directory-safe Hive partition value."""
+    return str(value).replace('/', '_') if value else 'unknown'
+
+
+class ParquetExporter:
+    """Export signals, scores and ratings from a SignalDatabase to Parquet."""
+
+    def __init__(self, db, export_dir: str = None, batch_size: int = None):
+        """
+        Args:
+            db: SignalDatabase to read from
+            export_dir: Root of the export (default: EXPORT_DIR)
+            batch_size: Rows read per query (default: EXPORT_BATCH)
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+        self.db = db
+        self.export_dir = Path(export_dir or EXPORT_DIR)
+        self.batch_size = batch_size or EXPORT_BATCH
+
+    @property
+    def state_path(self) -> Path:
+        return self.export_dir / STATE_FILE
+
+    def load_state(self) -> Dict[str, Any]:
+        """Export position: last signal and rating id written."""
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {'signals_last_id': 0, 'ratings_last_id': 0}
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        tmp = self.state_path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp, self.state_path)
+
+    def export(self, full: bool = False) -> Dict[str, int]:
+        """
+        Sync the export with the database.
+
+        Args:
+            full: Discard the existing export and write everything again
+
+        Returns:
+            Rows written per table
+        """
+        if full and self.export_dir.exists():
+            for table in ('signals', 'scores', 'ratings'):
+                shutil.rmtree(self.export_dir / table, ignore_errors=True)
+            self.state_path.unlink(missing_ok=True)
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+        state = self.load_state()
+
+        # Append-only tables: new rows only; state moves after each batch
+        counts = {}
+        for table, fetch, to_record, schema in (
+            ('signals', self.db.get_signals_after, signal_record, signal_schema()),
+            ('ratings', self.db.get_ratings_after, rating_record, rating_schema()),
+        ):
+            key = f'{table}_last_id'
+            counts[table] = 0
+            while True:
+                rows = fetch(state.get(key, 0), self.batch_size)
+                if not rows:
+                    break
+                self._write_partitions(self.export_dir / table, rows, to_record, schema)
+                counts[table] += len(rows)
+                state[key] = rows[-1]['id']
+                self._save_state(state)
+                if len(rows) < self.batch_size:
+                    break
+
+        counts['scores'] = self._export_scores()
+        state['scores_exported_at'] = datetime.now().isoformat(timespec='seconds')
+        self._save_state(state)
+
+        logger.info(f"Exported {counts} to {self.export_dir}")
+        return counts
+
+    def _export_scores(self) -> int:
+        """Rebuild the scores tree next to the old one, then swap it in."""
+        target = self.export_dir / 'scores'
+        staging = self.export_dir / 'scores.tmp'
+        shutil.rmtree(staging, ignore_errors=True)
+
+        count = 0
+        last_signal_id = 0
+        schema = score_schema()
+        while True:
+            rows = self.db.get_scores_after(last_signal_id, self.batch_size)
+            if not rows:
+                break
+            self._write_partitions(staging, rows, score_record, schema, id_field='signal_id')
+            count += len(rows)
+            last_signal_id = rows[-1]['signal_id']
+            if len(rows) < self.batch_size:
+                break
+
+        staging.mkdir(parents=True, exist_ok=True)
+        previous = self.export_dir / 'scores.old'
+        shutil.rmtree(previous, ignore_errors=True)
+        if target.exists():
+            target.rename(previous)
+        staging.rename(target)
+        shutil.rmtree(previous, ignore_errors=True)
+        return count
+
+    def _write_partitions(self, root: Path, rows: List[Dict[str, Any]],
+                          to_record: Callable[[Dict[str, Any]], Dict[str, Any]],
+                          schema: 'pa.Schema', id_field: str = 'id') -> None:
+        """Write one batch of rows as one part file per (month, source) partition."""
+        partitions: Dict[tuple, List[Dict[str, Any]]] = {}
+        for row in rows:
+            key = (_partition_value(row.get('month')), _partition_value(row.get('source')))
+            partitions.setdefault(key, []).append(to_record(row))
+
+        for (month, source), records in partitions.items():
+            directory = root / f'month={month}' / f'source={source}'
+            directory.mkdir(parents=True, exist_ok=True)
+            table = pa.Table.from_pylist(records, schema=schema)
+            # Named by first id: re-exporting a batch after a crash overwrites it
+            name = f'part-{records[0][id_field]}.parquet'
+            pq.write_table(table, directory / name, compression='zstd')
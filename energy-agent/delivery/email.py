@@ -8,6 +8,7 @@ Sends daily digest emails with:
 """
 import smtplib
 import ssl
+import json
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
@@ -17,6 +18,8 @@ import os
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from config.settings import SCORE_COMPONENTS
+
 try:
     from synthesis.llm import generate_digest_narrative, analyze_convergence
     LLM_AVAILABLE = True
@@ -211,6 +214,22 @@ class EmailDelivery:
             for _, t in tickers[:3]
         )
     
+    def _breakdown_text(self, sig: Dict) -> str:
+        """
+        Score breakdown as JSON, built only when a signal is rendered.
+        
+        Freshly scored signals carry score['breakdown']; rows from the
+        database carry the component points as columns instead.
+        """
+        breakdown = sig.get('score', {}).get('breakdown')
+        if breakdown is None:
+            breakdown = {name: sig[name] for name in SCORE_COMPONENTS if sig.get(name)}
+            if sig.get('attention_score') is not None:
+                breakdown['attention'] = sig['attention_score']
+            if sig.get('preference') not in (None, 1.0):
+                breakdown['preference_adjustment'] = sig['preference']
+        return json.dumps(breakdown)
+    
     def _feedback_html(self, sig: Dict, idx: int) -> str:
         """Build thumbs up/down mailto links for a signal."""
         from urllib.parse import quote
@@ -285,7 +304,7 @@ class EmailDelivery:
                     &nbsp;&nbsp;{self._feedback_html(sig, i)}
                 </p>
                 <p style="font-size: 12px; color: #999;">
-                    Score breakdown: {score.get('breakdown', {})}
+                    Score breakdown: {self._breakdown_text(sig)}
                 </p>
             </div>
             """
@@ -9,16 +9,17 @@ import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 import sys
+import time
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from collectors.uspto import USPTOCollector
-from collectors.arxiv import ArxivCollector
-from collectors.sec import SECCollector
-from collectors.osint import OSINTCollector
-from collectors.lens import LensPatentCollector, LensScholarCollector
+from collectors.executor import CollectorExecutor, default_collectors
 from scoring.engine import ScoringEngine, score_signals
+from scoring.convergence import WindowedConvergenceIndex
+from scoring.preferences import get_preferences, learn_preferences
+from scoring.parallel import score_parallel
+from config.settings import SCORING_PARALLEL_THRESHOLD
 from data.database import SignalDatabase
 
 # Configure logging
@@ -34,80 +35,25 @@ logger = logging.getLogger(__name__)
 
 
 def collect_all(date_from: datetime = None, date_to: datetime = None) -> list:
-    """Run all collectors and return combined signals."""
+    """Run all collectors concurrently and return combined signals."""
     if date_to is None:
         date_to = datetime.now()
     if date_from is None:
         date_from = date_to - timedelta(days=1)
     
-    all_signals = []
-    
-    # USPTO Patents
-    logger.info("Collecting USPTO patents...")
-    try:
-        uspto = USPTOCollector()
-        patents = uspto.collect(date_from, date_to)
-        all_signals.extend(patents)
-        logger.info(f"Collected {len(patents)} patents")
-    except Exception as e:
-        logger.error(f"USPTO collection failed: {e}")
-    
-    # ArXiv Papers
-    logger.info("Collecting ArXiv papers...")
-    try:
-        arxiv = ArxivCollector()
-        papers = arxiv.collect(date_from, date_to)
-        all_signals.extend(papers)
-        logger.info(f"Collected {len(papers)} papers")
-    except Exception as e:
-        logger.error(f"ArXiv collection failed: {e}")
-    
-    # SEC Filings
-    logger.info("Collecting SEC filings...")
-    try:
-        sec = SECCollector()
-        filings = sec.collect(date_from, date_to)
-        all_signals.extend(filings)
-        logger.info(f"Collected {len(filings)} SEC filings")
-    except Exception as e:
-        logger.error(f"SEC collection failed: {e}")
-    
-    # Lens.org Patents
-    logger.info("Collecting Lens.org patents...")
-    try:
-        lens_pat = LensPatentCollector()
-        lens_patents = lens_pat.collect(date_from, date_to)
-        all_signals.extend(lens_patents)
-        logger.info(f"Collected {len(lens_patents)} Lens patents")
-    except Exception as e:
-        logger.error(f"Lens patent collection failed: {e}")
-    
-    # Lens.org Scholarly Articles
-    logger.info("Collecting Lens.org scholarly articles...")
-    try:
-        lens_sch = LensScholarCollector()
-        lens_papers = lens_sch.collect(date_from, date_to)
-        all_signals.extend(lens_papers)
-        logger.info(f"Collected {len(lens_papers)} Lens scholarly articles")
-    except Exception as e:
-        logger.error(f"Lens scholar collection failed: {e}")
-    
-    # OSINT (Reddit + News from Kali)
-    logger.info("Collecting OSINT signals from Kali...")
-    try:
-        osint = OSINTCollector()
-        social_signals = osint.collect(days_back=1)
-        all_signals.extend(social_signals)
-        logger.info(f"Collected {len(social_signals)} OSINT signals")
-    except Exception as e:
-        logger.error(f"OSINT collection failed: {e}")
-    
-    logger.info(f"Total signals collected: {len(all_signals)}")
-    return all_signals
-
-
-def run_daily_collection():
-    """Run daily collection, scoring, and store in database."""
+    executor = CollectorExecutor()
+    return executor.collect(date_from, date_to)
+
+
+def run_daily_collection(days: int = 1):
+    """
+    Run daily collection, scoring, and store in database.
+    
+    `days` always sets the report window, which is read from the database.
+    Collection only uses it until a source has a watermark: after that each
+    domain resumes from its watermark, so a larger --days does not re-collect
+    older items (use --mode backfill for that).
+    """
     logger.info("=" * 60)
     logger.info("Starting daily collection run")
     logger.info("=" * 60)
@@ -115,30 +61,33 @@ def run_daily_collection():
     # Initialize database
     db = SignalDatabase()
     
-    # Collect signals (yesterday's data)
+    # Collect signals (last `days` days, only what is new since the last run)
     date_to = datetime.now()
-    date_from = date_to - timedelta(days=1)
-    signals = collect_all(date_from, date_to)
+    date_from = date_to - timedelta(days=days)
+    executor = CollectorExecutor(state=db)
+    signals = executor.collect(date_from, date_to)
     
-    # Store in database
+    # Store in database, then advance collection watermarks
     new_count = db.insert_signals(signals)
+    executor.commit_watermarks()
     logger.info(f"Stored {new_count} new signals ({len(signals) - new_count} duplicates)")
     
     # Score unscored signals
-    engine = ScoringEngine()
-    unscored = db.get_unscored_signals(limit=500)
+    engine = ScoringEngine.from_preferences(get_preferences(db))
+    index = WindowedConvergenceIndex(db)
+    pending = db.count_unscored()
     
-    for signal in unscored:
-        score_result = engine.score(signal, unscored)
-        db.save_score(
-            signal_id=signal['id'],
-            base_score=score_result['base_score'],
-            attention_score=score_result['attention_score'],
-            final_score=score_result['final_score'],
-            breakdown=score_result['breakdown']
-        )
+    if pending > SCORING_PARALLEL_THRESHOLD:
+        # Backlog after an outage or backfill: spread it over all cores
+        scored = score_parallel(db, engine, index)
+    else:
+        unscored = db.get_unscored_signals(limit=SCORING_PARALLEL_THRESHOLD)
+        batch = engine.score_batch(unscored, index=index)
+        
+        db.save_scores_bulk((signal['id'], result) for signal, result in zip(unscored, engine.batch_results(batch)))
+        scored = len(unscored)
     
-    logger.info(f"Scored {len(unscored)} signals")
+    logger.info(f"Scored {scored} signals")
     
     # Get top signals for report
     top_signals = db.get_top_signals(date_from=date_from, limit=15)
@@ -166,6 +115,88 @@ def run_daily_collection():
     return top_signals
 
 
+def run_backfill(date_from: datetime, date_to: datetime, chunk_days: int = 7,
+                 chunk_workers: int = 2, sources: list = None):
+    """Collect a historical date range in checkpointed chunks and store it."""
+    logger.info("=" * 60)
+    logger.info(f"Starting backfill {date_from:%Y-%m-%d} .. {date_to:%Y-%m-%d} ({chunk_days}-day chunks)")
+    logger.info("=" * 60)
+    
+    db = SignalDatabase()
+    collectors = default_collectors()
+    if sources:
+        collectors = [c for c in collectors if c.name in sources]
+    
+    # No watermark store: a backfill must see the whole historical window
+    executor = CollectorExecutor(collectors)
+    results = executor.backfill(date_from, date_to, db, chunk_days=chunk_days, chunk_workers=chunk_workers)
+    
+    print("\n" + "=" * 60)
+    print("BACKFILL RESULTS")
+    print("=" * 60)
+    for name, result in results.items():
+        print(f"{name}: {result['done']}/{result['chunks']} chunks, "
+              f"{result['signals']} signals ({result['new']} new), {result['failed']} failed")
+    if any(r['failed'] for r in results.values()):
+        print("\nRe-run the same command to retry failed chunks.")
+    
+    return results
+
+
+def run_rescore():
+    """Recombine stored scores after a preference weight or threshold change."""
+    db = SignalDatabase()
+    engine = ScoringEngine.from_preferences(get_preferences(db))
+    
+    started = time.monotonic()
+    count = engine.rescore(db)
+    logger.info(f"Rescored {count} signals in {time.monotonic() - started:.2f}s")
+    return count
+
+
+def run_learn_preferences():
+    """Learn preference weights from ratings added since the last run."""
+    db = SignalDatabase()
+    result = learn_preferences(db)
+    
+    print(f"Learned from {result['ratings']} new ratings ({result['keys']} weights updated, "
+          f"version {result['version']})")
+    for preference_type, weights in sorted(get_preferences(db).weights.items()):
+        print(f"  {preference_type}: " + ', '.join(f"{k}={w:.2f}" for k, w in sorted(weights.items())))
+    return result
+
+
+def run_export(full: bool = False):
+    """Sync the Parquet analytics export with the database."""
+    from data.export import ParquetExporter
+    
+    db = SignalDatabase()
+    exporter = ParquetExporter(db)
+    started = time.monotonic()
+    counts = exporter.export(full=full)
+    
+    print(f"Exported {counts['signals']} signals, {counts['ratings']} ratings and "
+          f"{counts['scores']} scores to {exporter.export_dir} in {time.monotonic() - started:.1f}s")
+    return counts
+
+
+def run_search(query: str, date_from: datetime = None, domain: str = None, limit: int = 20):
+    """Full-text search stored signals and print the best matches."""
+    db = SignalDatabase()
+    started = time.monotonic()
+    results = db.search(query, date_from=date_from, domain=domain, limit=limit)
+    elapsed = time.monotonic() - started
+    
+    print(f"{len(results)} signals matching {query!r} ({elapsed * 1000:.0f} ms)")
+    for i, sig in enumerate(results, 1):
+        score = f"{sig['final_score']:.1f}" if sig.get('final_score') is not None else '-'
+        print(f"\n{i}. [{score}] {sig.get('title', '')[:70]}")
+        print(f"   {sig.get('signal_date') or 'undated'} | Source: {sig['source']} | "
+              f"Domain: {sig.get('domain') or 'unknown'}")
+        print(f"   URL: {sig.get('url', 'N/A')}")
+    return results
+
+
 def test_collection():
     """Test collection without storing to database."""
     logger.info("Running test collection (7 days, no database)")
@@ -189,10 +220,36 @@ def test_collection():
 
 def main():
     parser = argparse.ArgumentParser(description='Energy Intelligence Agent')
-    parser.add_argument('--mode', choices=['daily', 'test', 'stats'], default='test',
-                       help='Run mode: daily (full run), test (no DB), stats (show DB stats)')
-    parser.add_argument('--days', type=int, default=1,
-                       help='Number of days to look back')
+    parser.add_argument('--mode', choices=['daily', 'test', 'stats', 'backfill', 'rescore', 'learn', 'export', 'search'],
+                       default='test',
+                       help='Run mode: daily (full run), test (no DB), stats (show DB stats), '
+                            'backfill (historical range, resumable), '
+                            'rescore (recombine stored scores with current weights), '
+                            'learn (update preference weights from new ratings), '
+                            'export (sync Parquet files for analytics), '
+                            'search (full-text search of stored signals)')
+    parser.add_argument('--days', type=int,
+                       help='Number of days to look back (default: 1; search: all history). '
+                            'Daily collection resumes from stored watermarks, so this only '
+                            'widens the report, not what is collected')
+    parser.add_argument('--start', type=lambda d: datetime.strptime(d, '%Y-%m-%d'),
+                       help='Backfill: first day (YYYY-MM-DD, default: --days before --end)')
+    parser.add_argument('--end', type=lambda d: datetime.strptime(d, '%Y-%m-%d'),
+                       help='Backfill: last day (YYYY-MM-DD, default: today)')
+    parser.add_argument('--chunk-days', type=int, default=7,
+                       help='Backfill: days per chunk')
+    parser.add_argument('--workers', type=int, default=2,
+                       help='Backfill: concurrent chunks per source')
+    parser.add_argument('--sources', nargs='+',
+                       help='Backfill: only these collectors (e.g. arxiv sec lens_patent)')
+    parser.add_argument('--query',
+                       help='Search: FTS5 query, e.g. HALEU or "small modular reactor"')
+    parser.add_argument('--domain',
+                       help='Search: only this technology domain')
+    parser.add_argument('--limit', type=int, default=20,
+                       help='Search: maximum results')
+    parser.add_argument('--full', action='store_true',
+                       help='Export: rewrite the whole export instead of adding new rows')
     
     args = parser.parse_args()
     
@@ -200,7 +257,23 @@ def main():
     (Path(__file__).parent / 'logs').mkdir(exist_ok=True)
     
     if args.mode == 'daily':
-        run_daily_collection()
+        run_daily_collection(days=args.days or 1)
+    elif args.mode == 'backfill':
+        date_to = args.end or datetime.now()
+        date_from = args.start or date_to - timedelta(days=args.days or 1)
+        run_backfill(date_from, date_to, chunk_days=args.chunk_days,
+                     chunk_workers=args.workers, sources=args.sources)
+    elif args.mode == 'rescore':
+        run_rescore()
+    elif args.mode == 'learn':
+        run_learn_preferences()
+    elif args.mode == 'export':
+        run_export(full=args.full)
+    elif args.mode == 'search':
+        if not args.query:
+            parser.error('--mode search requires --query')
+        date_from = args.start or (datetime.now() - timedelta(days=args.days) if args.days else None)
+        run_search(args.query, date_from=date_from, domain=args.domain, limit=args.limit)
     elif args.mode == 'test':
         test_collection()
     elif args.mode == 'stats':
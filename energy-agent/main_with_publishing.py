@@ -18,12 +18,10 @@ from dotenv import load_dotenv
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from collectors.uspto import USPTOCollector
-from collectors.arxiv import ArxivCollector
-from collectors.sec import SECCollector
-from collectors.osint import OSINTCollector
-from collectors.lens import LensPatentCollector, LensScholarCollector
+from collectors.executor import CollectorExecutor
 from scoring.engine import ScoringEngine, score_signals
+from scoring.convergence import WindowedConvergenceIndex
+from scoring.preferences import get_preferences
 from data.database import SignalDatabase
 from multi_platform_publisher import MultiPlatformPublisher
 
@@ -43,76 +41,14 @@ logger = logging.getLogger(__name__)
 
 
 def collect_all(date_from: datetime = None, date_to: datetime = None) -> list:
-    """Run all collectors and return combined signals."""
+    """Run all collectors concurrently and return combined signals."""
     if date_to is None:
         date_to = datetime.now()
     if date_from is None:
         date_from = date_to - timedelta(days=1)
     
-    all_signals = []
-    
-    # USPTO Patents
-    logger.info("Collecting USPTO patents...")
-    try:
-        uspto = USPTOCollector()
-        patents = uspto.collect(date_from, date_to)
-        all_signals.extend(patents)
-        logger.info(f"Collected {len(patents)} patents")
-    except Exception as e:
-        logger.error(f"USPTO collection failed: {e}")
-    
-    # ArXiv Papers
-    logger.info("Collecting ArXiv papers...")
-    try:
-        arxiv = ArxivCollector()
-        papers = arxiv.collect(date_from, date_to)
-        all_signals.extend(papers)
-        logger.info(f"Collected {len(papers)} papers")
-    except Exception as e:
-        logger.error(f"ArXiv collection failed: {e}")
-    
-    # SEC Filings
-    logger.info("Collecting SEC filings...")
-    try:
-        sec = SECCollector()
-        filings = sec.collect(date_from, date_to)
-        all_signals.extend(filings)
-        logger.info(f"Collected {len(filings)} SEC filings")
-    except Exception as e:
-        logger.error(f"SEC collection failed: {e}")
-    
-    # Lens.org Patents
-    logger.info("Collecting Lens.org patents...")
-    try:
-        lens_pat = LensPatentCollector()
-        lens_patents = lens_pat.collect(date_from, date_to)
-        all_signals.extend(lens_patents)
-        logger.info(f"Collected {len(lens_patents)} Lens patents")
-    except Exception as e:
-        logger.error(f"Lens patent collection failed: {e}")
-    
-    # Lens.org Scholarly Articles
-    logger.info("Collecting Lens.org scholarly articles...")
-    try:
-        lens_sch = LensScholarCollector()
-        lens_papers = lens_sch.collect(date_from, date_to)
-        all_signals.extend(lens_papers)
-        logger.info(f"Collected {len(lens_papers)} Lens scholarly articles")
-    except Exception as e:
-        logger.error(f"Lens scholar collection failed: {e}")
-    
-    # OSINT (Reddit + News from Kali)
-    logger.info("Collecting OSINT signals from Kali...")
-    try:
-        osint = OSINTCollector()
-        social_signals = osint.collect(days_back=1)
-        all_signals.extend(social_signals)
-        logger.info(f"Collected {len(social_signals)} OSINT signals")
-    except Exception as e:
-        logger.error(f"OSINT collection failed: {e}")
-    
-    logger.info(f"Total signals collected: {len(all_signals)}")
-    return all_signals
+    executor = CollectorExecutor()
+    return executor.collect(date_from, date_to)
 
 
 def create_intelligence_summary(top_signals, total_signals_count):
@@ -246,28 +182,23 @@ def run_daily_collection_with_publishing():
     # Initialize database
     db = SignalDatabase()
     
-    # Collect signals (yesterday's data)
+    # Collect signals (yesterday's data, only what is new since the last run)
     date_to = datetime.now()
     date_from = date_to - timedelta(days=1)
-    signals = collect_all(date_from, date_to)
+    executor = CollectorExecutor(state=db)
+    signals = executor.collect(date_from, date_to)
     
-    # Store in database
+    # Store in database, then advance collection watermarks
     new_count = db.insert_signals(signals)
+    executor.commit_watermarks()
     logger.info(f"Stored {new_count} new signals ({len(signals) - new_count} duplicates)")
     
     # Score unscored signals
-    engine = ScoringEngine()
+    engine = ScoringEngine.from_preferences(get_preferences(db))
     unscored = db.get_unscored_signals(limit=500)
+    batch = engine.score_batch(unscored, index=WindowedConvergenceIndex(db))
     
-    for signal in unscored:
-        score_result = engine.score(signal, unscored)
-        db.save_score(
-            signal_id=signal['id'],
-            base_score=score_result['base_score'],
-            attention_score=score_result['attention_score'],
-            final_score=score_result['final_score'],
-            breakdown=score_result['breakdown']
-        )
+    db.save_scores_bulk((signal['id'], result) for signal, result in zip(unscored, engine.batch_results(batch)))
     
     logger.info(f"Scored {len(unscored)} signals")
     
@@ -311,28 +242,23 @@ def run_daily_collection():
     # Initialize database
     db = SignalDatabase()
     
-    # Collect signals (yesterday's data)
+    # Collect signals (yesterday's data, only what is new since the last run)
     date_to = datetime.now()
     date_from = date_to - timedelta(days=1)
-    signals = collect_all(date_from, date_to)
+    executor = CollectorExecutor(state=db)
+    signals = executor.collect(date_from, date_to)
     
-    # Store in database
+    # Store in database, then advance collection watermarks
     new_count = db.insert_signals(signals)
+    executor.commit_watermarks()
     logger.info(f"Stored {new_count} new signals ({len(signals) - new_count} duplicates)")
     
     # Score unscored signals
-    engine = ScoringEngine()
+    engine = ScoringEngine.from_preferences(get_preferences(db))
     unscored = db.get_unscored_signals(limit=500)
+    batch = engine.score_batch(unscored, index=WindowedConvergenceIndex(db))
     
-    for signal in unscored:
-        score_result = engine.score(signal, unscored)
-        db.save_score(
-            signal_id=signal['id'],
-            base_score=score_result['base_score'],
-            attention_score=score_result['attention_score'],
-            final_score=score_result['final_score'],
-            breakdown=score_result['breakdown']
-        )
+    db.save_scores_bulk((signal['id'], result) for signal, result in zip(unscored, engine.batch_results(batch)))
     
     logger.info(f"Scored {len(unscored)} signals")
     
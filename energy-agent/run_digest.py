@@ -9,12 +9,10 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from collectors.arxiv import ArxivCollector
-from collectors.sec import SECCollector
-from collectors.osint import OSINTCollector
-from collectors.uspto import USPTOCollector
-from collectors.lens import LensPatentCollector, LensScholarCollector
+from collectors.executor import CollectorExecutor
 from scoring.engine import ScoringEngine
+from scoring.convergence import WindowedConvergenceIndex
+from scoring.preferences import get_preferences
 from data.database import SignalDatabase
 from delivery.email import EmailDelivery
 from x_integration import AlphaENRGPoster
@@ -30,6 +28,12 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _with_score(sig: dict) -> dict:
+    """Give a stored top signal the 'score' dict the email and X formatting expect."""
+    sig['score'] = {'final_score': sig['final_score'], 'category': sig['category']}
+    return sig
+
+
 def run_full_digest():
     """Run complete collection, scoring, and email delivery."""
     
@@ -41,144 +45,80 @@ def run_full_digest():
     date_to = datetime.now()
     date_from = date_to - timedelta(days=7)
     
-    all_signals = []
-    
-    # Collect from ArXiv
-    logger.info("\n📚 Collecting ArXiv papers...")
-    try:
-        arxiv = ArxivCollector()
-        papers = arxiv.collect(date_from, date_to)
-        all_signals.extend(papers)
-        logger.info(f"   → {len(papers)} papers")
-    except Exception as e:
-        logger.error(f"   ✗ ArXiv failed: {e}")
-    
-    # Collect from SEC
-    logger.info("\n📊 Collecting SEC filings...")
-    try:
-        sec = SECCollector()
-        filings = sec.collect(date_from, date_to)
-        all_signals.extend(filings)
-        logger.info(f"   → {len(filings)} filings")
-    except Exception as e:
-        logger.error(f"   ✗ SEC failed: {e}")
-    
-    # Collect OSINT from Kali (Reddit, news, darkweb)
-    logger.info("\n🕵️ Collecting OSINT signals...")
-    try:
-        osint = OSINTCollector()
-        osint_signals = osint.collect(days_back=7)
-        all_signals.extend(osint_signals)
-        logger.info(f"   → {len(osint_signals)} OSINT signals")
-    except Exception as e:
-        logger.error(f"   ✗ OSINT failed: {e}")
-    
-    # Collect patents from Lens.org
-    logger.info("\n🔬 Collecting Lens.org patents...")
-    try:
-        lens_pat = LensPatentCollector()
-        lens_patents = lens_pat.collect(date_from, date_to)
-        all_signals.extend(lens_patents)
-        logger.info(f"   → {len(lens_patents)} Lens patents")
-    except Exception as e:
-        logger.error(f"   ✗ Lens patents failed: {e}")
-    
-    # Collect scholarly articles from Lens.org
-    logger.info("\n📖 Collecting Lens.org scholarly articles...")
-    try:
-        lens_sch = LensScholarCollector()
-        lens_papers = lens_sch.collect(date_from, date_to)
-        all_signals.extend(lens_papers)
-        logger.info(f"   → {len(lens_papers)} Lens scholarly articles")
-    except Exception as e:
-        logger.error(f"   ✗ Lens scholarly failed: {e}")
+    # Collect from every source concurrently, only what is new since the last run
+    logger.info("\n📡 Collecting from all sources...")
+    db = SignalDatabase()
+    executor = CollectorExecutor(state=db)
+    results = executor.run(date_from, date_to)
     
-    # Collect patents from USPTO/PatentsView
-    logger.info("\n📜 Collecting USPTO patents...")
-    try:
-        uspto = USPTOCollector()
-        patents = uspto.collect(date_from, date_to)
-        all_signals.extend(patents)
-        logger.info(f"   → {len(patents)} patents")
-    except Exception as e:
-        logger.error(f"   ✗ USPTO failed: {e}")
+    all_signals = []
+    for name, result in results.items():
+        if result['error']:
+            logger.error(f"   ✗ {name} failed after {result['elapsed']:.1f}s: {result['error']}")
+        else:
+            logger.info(f"   → {name}: {result['count']} signals in {result['elapsed']:.1f}s")
+        all_signals.extend(result['signals'])
     
     logger.info(f"\n📦 Total signals collected: {len(all_signals)}")
     
-    # Score all signals
+    # Store first, then advance collection watermarks
+    logger.info("\n💾 Storing in database...")
+    ids = db.upsert_signals(all_signals)
+    executor.commit_watermarks()
+    logger.info(f"   → {len(ids)} signals stored")
+    
+    # Score this run's signals
     logger.info("\n🎯 Scoring signals...")
-    engine = ScoringEngine()
+    engine = ScoringEngine.from_preferences(get_preferences(db))
+    batch = engine.score_batch(all_signals, index=WindowedConvergenceIndex(db, batch=all_signals))
     scored_signals = []
     
-    for signal in all_signals:
-        score_result = engine.score(signal, all_signals)
+    for signal, score_result in zip(all_signals, engine.batch_results(batch)):
         signal['score'] = score_result
+        signal['id'] = ids.get((signal['source'], signal['source_id']))
         scored_signals.append(signal)
     
-    # Sort by final score
-    scored_signals.sort(key=lambda x: x['score']['final_score'], reverse=True)
+    saved = db.save_scores_bulk(
+        (sig['id'], sig['score']) for sig in scored_signals
+        if sig['id']
+    )
+    logger.info(f"   → {saved} scores saved")
     
-    # Categorize
-    critical = [s for s in scored_signals if s['score']['category'] == 'critical']
-    strong = [s for s in scored_signals if s['score']['category'] == 'strong']
-    interesting = [s for s in scored_signals if s['score']['category'] == 'interesting']
+    # Collection is incremental (watermarks shared with the daily run), so the
+    # digest itself is built from the whole 7-day window in the database
+    stats = db.get_stats(date_from=date_from)
+    by_category = stats['by_category']
+    top_signals = [_with_score(sig) for sig in db.get_top_signals(date_from=date_from, limit=13)]
     
-    logger.info(f"   🚨 Critical (≥12): {len(critical)}")
-    logger.info(f"   ⭐ Strong (≥7): {len(strong)}")
-    logger.info(f"   📋 Interesting (≥4): {len(interesting)}")
+    logger.info(f"   🚨 Critical (≥12): {by_category.get('critical', 0)}")
+    logger.info(f"   ⭐ Strong (≥7): {by_category.get('strong', 0)}")
+    logger.info(f"   📋 Interesting (≥4): {by_category.get('interesting', 0)}")
     
     # Print top 10
     logger.info("\n" + "=" * 60)
     logger.info("TOP 10 SIGNALS")
     logger.info("=" * 60)
     
-    for i, sig in enumerate(scored_signals[:10], 1):
+    for i, sig in enumerate(top_signals[:10], 1):
         score = sig['score']
         logger.info(f"\n{i}. [{score['final_score']:.1f}] {sig['title'][:60]}...")
         logger.info(f"   Domain: {sig.get('domain', 'N/A')} | Source: {sig['source']}")
         logger.info(f"   Category: {score['category']}")
     
-    # Store in database
-    logger.info("\n💾 Storing in database...")
-    db = SignalDatabase()
-    new_count = db.insert_signals(scored_signals)
-    logger.info(f"   → {new_count} new signals stored")
-    
-    # Save scores
-    for sig in scored_signals:
-        if sig.get('id'):  # Only if we have a DB id
-            db.save_score(
-                signal_id=sig['id'],
-                base_score=sig['score']['base_score'],
-                attention_score=sig['score']['attention_score'],
-                final_score=sig['score']['final_score'],
-                breakdown=sig['score']['breakdown']
-            )
-    
     # Send email digest
     logger.info("\n📧 Sending digest email...")
     delivery = EmailDelivery()
     
-    top_3 = scored_signals[:3]
-    next_10 = scored_signals[3:13]
-    
-    stats = {
-        'total_signals': len(all_signals),
-        'by_source': {},
-        'by_domain': {}
-    }
-    for sig in all_signals:
-        src = sig.get('source', 'unknown')
-        stats['by_source'][src] = stats['by_source'].get(src, 0) + 1
-        dom = sig.get('domain', 'unknown')
-        stats['by_domain'][dom] = stats['by_domain'].get(dom, 0) + 1
+    top_3 = top_signals[:3]
+    next_10 = top_signals[3:13]
     
     if delivery.send_digest(top_3, next_10, stats):
         logger.info("   ✅ Digest sent!")
     else:
         logger.error("   ✗ Failed to send digest")
     
-    # Send critical alerts
+    # Send critical alerts for signals collected in this run only
+    critical = [s for s in scored_signals if s['score']['category'] == 'critical']
     for sig in critical:
         logger.info(f"\n🚨 Sending critical alert for: {sig['title'][:40]}...")
         delivery.send_critical_alert(sig)
@@ -194,11 +134,11 @@ def run_full_digest():
             intelligence_text = f"""🎯 Top Energy Signal: {top_signal['title'][:80]}
 📊 Score: {top_signal['score']['final_score']:.1f}/20
 🔬 Domain: {top_signal.get('domain', 'Energy')}
-📈 {len(critical)} critical signals detected this cycle"""
+📈 {by_category.get('critical', 0)} critical signals detected this cycle"""
         else:
             intelligence_text = f"""📊 Energy Market Analysis Complete
-🔬 {len(all_signals)} signals processed
-📈 {len(strong)} strong opportunities identified  
+🔬 {stats['total_signals']} signals processed
+📈 {by_category.get('strong', 0)} strong opportunities identified  
 🎯 AlphaENRG intelligence synthesis active"""
         
         x_success = x_poster.post_daily_intelligence(intelligence_text)
@@ -221,7 +161,7 @@ def run_full_digest():
     logger.info("✅ DIGEST RUN COMPLETE")
     logger.info("=" * 60)
     
-    return scored_signals
+    return top_signals
 
 
 if __name__ == "__main__":
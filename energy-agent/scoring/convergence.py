@@ -0,0 +1,179 @@
+"""
+Inverted entity index for convergence scoring.
+
+Convergence counts how many signals from *other* sources mention a company or
+technology that a signal also mentions. Comparing every signal with every
+other one is O(n²); this index maps each entity to the sources and signals
+that mention it, so a signal's matches are found by looking up its own
+entities only.
+
+The index is built once per batch and can be updated as signals arrive or
+leave the window. `WindowedConvergenceIndex` answers the same question over
+the trailing window of signals stored in the database, so convergence holds
+across runs without loading the window into memory.
+"""
+from collections import defaultdict
+from datetime import datetime, date
+from typing import Dict, Any, List, Iterable, Set, Tuple
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import CONVERGENCE_WINDOW_DAYS
+
+# Entity types that count towards convergence
+ENTITY_FIELDS = ('companies', 'technologies')
+
+
+def signal_key(signal: Dict[str, Any]) -> Tuple[str, str]:
+    """Identity of a signal within the index."""
+    return (signal.get('source'), signal.get('source_id'))
+
+
+def signal_entities(signal: Dict[str, Any]) -> Set[Tuple[str, str]]:
+    """(field, value) pairs a signal mentions."""
+    entities = signal.get('entities') or {}
+    return {
+        (field, value)
+        for field in ENTITY_FIELDS
+        for value in entities.get(field) or []
+        if value
+    }
+
+
+class ConvergenceIndex:
+    """Entity -> source -> signal keys."""
+
+    def __init__(self, signals: Iterable[Dict[str, Any]] = None):
+        self._index: Dict[Tuple[str, str], Dict[str, Set[Tuple[str, str]]]] = defaultdict(lambda: defaultdict(set))
+        self._entities: Dict[Tuple[str, str], Set[Tuple[str, str]]] = {}
+        if signals:
+            self.add_all(signals)
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __contains__(self, signal: Dict[str, Any]) -> bool:
+        return signal_key(signal) in self._entities
+
+    def add(self, signal: Dict[str, Any]) -> None:
+        """Index a signal's companies and technologies."""
+        key = signal_key(signal)
+        if key in self._entities:
+            self.remove(signal)
+        entities = signal_entities(signal)
+        self._entities[key] = entities
+        for entity in entities:
+            self._index[entity][key[0]].add(key)
+
+    def add_all(self, signals: Iterable[Dict[str, Any]]) -> None:
+        for signal in signals:
+            self.add(signal)
+
+    def remove(self, signal: Dict[str, Any]) -> None:
+        """Drop a signal from the index, e.g. when it leaves the time window."""
+        key = signal_key(signal)
+        for entity in self._entities.pop(key, ()):
+            by_source = self._index[entity]
+            by_source[key[0]].discard(key)
+            if not by_source[key[0]]:
+                del by_source[key[0]]
+            if not by_source:
+                del self._index[entity]
+
+    def match_count(self, signal: Dict[str, Any], limit: int = 2) -> int:
+        """
+        Number of signals from other sources sharing an entity with this one.
+
+        Counting stops at limit, since convergence scoring only distinguishes
+        none, one and two-or-more matches.
+        """
+        return len(self.matching_keys(signal, limit))
+
+    def matching_keys(self, signal: Dict[str, Any], limit: int = 2) -> Set[Tuple[str, str]]:
+        """Keys of up to limit signals from other sources sharing an entity with this one."""
+        source = signal.get('source')
+        matched = set()
+        for entity in signal_entities(signal):
+            for other_source, keys in self._index.get(entity, {}).items():
+                if other_source == source:
+                    continue  # Must be different source type (this also skips the signal itself)
+                for key in keys:
+                    matched.add(key)
+                    if len(matched) >= limit:
+                        return matched
+        return matched
+
+    def sources_for(self, field: str, value: str) -> List[str]:
+        """Sources currently mentioning an entity."""
+        return sorted(self._index.get((field, value), {}))
+
+
+def epoch_day(when: datetime) -> int:
+    """Days since 1970-01-01 for a date or datetime."""
+    if isinstance(when, datetime):
+        when = when.date()
+    return (when - date(1970, 1, 1)).days
+
+
+class WindowedConvergenceIndex:
+    """
+    Convergence over the signals stored in the last CONVERGENCE_WINDOW_DAYS.
+
+    Entity mentions live in the database (entity_mentions), with per-source
+    mention counts kept alongside (entity_window_counts). refresh() evicts
+    mentions that fell out of the window and indexes newly stored signals;
+    the small counts table is then held in memory, so most lookups never
+    touch the database. Signals not yet stored can be passed as batch.
+    """
+
+    def __init__(self, db, days: int = None, batch: Iterable[Dict[str, Any]] = None,
+                 now: datetime = None):
+        """
+        Args:
+            db: SignalDatabase holding the window
+            days: Window length (default: CONVERGENCE_WINDOW_DAYS)
+            batch: Signals being scored that may not be stored yet
+            now: End of the window (default: now)
+        """
+        self.db = db
+        self.days = days or CONVERGENCE_WINDOW_DAYS
+        self.batch = ConvergenceIndex(batch) if batch else None
+        self._counts: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self.refresh(now)
+
+    def refresh(self, now: datetime = None) -> Dict[str, int]:
+        """Slide the window to end at now. Returns mentions added and evicted."""
+        start_day = epoch_day(now or datetime.now()) - self.days
+        changes = self.db.sync_entity_window(start_day)
+        self._counts = self.db.get_entity_window_counts()
+        return changes
+
+    def source_count(self, field: str, value: str) -> int:
+        """Number of distinct sources mentioning an entity in the window."""
+        return len(self._counts.get((field, value), {}))
+
+    def match_count(self, signal: Dict[str, Any], limit: int = 2) -> int:
+        """
+        Number of signals from other sources sharing an entity with this one,
+        counting stored signals in the window plus the unsaved batch.
+
+        Counting stops at limit. Per-source counts settle most signals; only
+        when no single entity reaches the limit are the matching signals
+        looked up, so one signal matched through two entities counts once.
+        """
+        source = signal.get('source')
+        entities = signal_entities(signal)
+        stored = 0
+        for entity in entities:
+            mentions = sum(n for other, n in self._counts.get(entity, {}).items() if other != source)
+            if mentions >= limit:
+                return limit
+            stored += mentions
+
+        matched = self.batch.matching_keys(signal, limit) if self.batch else set()
+        if stored and len(matched) < limit:
+            keys = self.db.get_entity_window_matches(entities, source, limit + len(matched))
+            matched.update(keys)
+        return min(len(matched), limit)
@@ -15,54 +15,82 @@ Thresholds:
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import logging
+import math
+
+import numpy as np
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import (
-    TIER_1_COMPANIES, TIER_1_VCS, TIER_2_COMPANIES,
-    TECHNOLOGY_KEYWORDS, SCORE_CRITICAL, SCORE_STRONG, SCORE_INTERESTING
+    GOVERNMENT_SOURCES, TRL_KEYWORDS, SCORE_COMPONENTS,
+    SCORE_CRITICAL, SCORE_STRONG, SCORE_INTERESTING
 )
+from scoring.convergence import ConvergenceIndex, epoch_day
+from scoring.features import get_matcher, scan_signal
+from scoring.preferences import PreferenceSnapshot, feature_keys
 
 logger = logging.getLogger(__name__)
 
+# Base score components, in breakdown order
+COMPONENTS = SCORE_COMPONENTS
+
+# Keyword features extracted as boolean columns for batch scoring
+FEATURE_FLAGS = ('government', 'trl_5_7', 'tier1', 'tier2', 'ma', 'impact', 'macro')
+
 
 class ScoringEngine:
     """Score signals based on the defined model."""
     
-    def __init__(self, user_preferences: Dict[str, float] = None):
+    def __init__(self, user_preferences: Dict[str, float] = None,
+                 feature_preferences: Dict[str, Dict[str, float]] = None):
         """
         Initialize scoring engine.
         
         Args:
             user_preferences: Learned weights from user feedback (domain -> weight)
+            feature_preferences: Learned weights per feature type
+                ('player_tier', 'trl', 'attention') -> key -> weight
         """
         self.user_preferences = user_preferences or {}
+        self.feature_preferences = feature_preferences or {}
     
-    def score(self, signal: Dict[str, Any], related_signals: List[Dict] = None) -> Dict[str, Any]:
+    @classmethod
+    def from_preferences(cls, snapshot: PreferenceSnapshot) -> 'ScoringEngine':
+        """Engine weighted by a learned preference snapshot (see get_preferences())."""
+        return cls(snapshot.domain, snapshot.features)
+    
+    def score(self, signal: Dict[str, Any], related_signals: List[Dict] = None,
+              index: ConvergenceIndex = None, now: datetime = None) -> Dict[str, Any]:
         """
         Score a signal.
         
         Args:
             signal: The signal to score
             related_signals: Other signals in same time window (for convergence detection)
+            index: Prebuilt convergence index over the window; when scoring a
+                batch, build it once and pass it instead of related_signals
+            now: Reference time for recency (default: now)
             
         Returns:
             Dict with base_score, attention_score, final_score, and breakdown
         """
         breakdown = {}
         
+        # One keyword scan of the text serves every text-based component
+        features = scan_signal(signal)
+        
         # Base score components
         base_score = 0
         
         # 1. Convergence (+3): Multiple independent sources
-        convergence_score = self._score_convergence(signal, related_signals or [])
+        convergence_score = self._score_convergence(signal, related_signals or [], index)
         base_score += convergence_score
         breakdown['convergence'] = convergence_score
         
         # 2. Government alignment (+2)
-        gov_score = self._score_government_alignment(signal)
+        gov_score = self._score_government_alignment(signal, features)
         base_score += gov_score
         breakdown['government'] = gov_score
         
@@ -72,41 +100,40 @@ class ScoringEngine:
         breakdown['capital'] = capital_score
         
         # 4. TRL 5-7 (+2)
-        trl_score = self._score_trl(signal)
+        trl_score = self._score_trl(signal, features)
         base_score += trl_score
         breakdown['trl'] = trl_score
         
         # 5. Player credibility (+1-2)
-        player_score = self._score_player(signal)
+        player_score = self._score_player(signal, features)
         base_score += player_score
         breakdown['player'] = player_score
         
         # 6. M&A likelihood (+1)
-        ma_score = self._score_ma_likelihood(signal)
+        ma_score = self._score_ma_likelihood(signal, features)
         base_score += ma_score
         breakdown['ma_likelihood'] = ma_score
         
         # 7. Novelty & impact (+1)
-        impact_score = self._score_impact(signal)
+        impact_score = self._score_impact(signal, features)
         base_score += impact_score
         breakdown['impact'] = impact_score
         
         # 8. Macro tailwind (+1)
-        macro_score = self._score_macro(signal)
+        macro_score = self._score_macro(signal, features)
         base_score += macro_score
         breakdown['macro'] = macro_score
         
         # Attention multiplier (0-3)
-        attention_score = self._score_attention(signal)
+        attention_score = self._score_attention(signal, now)
         breakdown['attention'] = attention_score
         
         # Final score calculation
         final_score = base_score * (1 + attention_score * 0.2)
         
         # Apply user preference weighting if available
-        domain = signal.get('domain')
-        if domain and domain in self.user_preferences:
-            preference_weight = self.user_preferences[domain]
+        preference_weight = self._preference_weight(signal.get('domain'), player_score, trl_score, attention_score)
+        if preference_weight is not None:
             final_score *= preference_weight
             breakdown['preference_adjustment'] = preference_weight
         
@@ -128,31 +155,268 @@ class ScoringEngine:
             'breakdown': breakdown
         }
     
-    def _score_convergence(self, signal: Dict, related: List[Dict]) -> float:
+    def score_batch(self, signals: List[Dict[str, Any]], index: ConvergenceIndex = None,
+                    now: datetime = None) -> Dict[str, Any]:
         """
-        +3 if ≥2 independent sources on same tech/company within 90 days.
+        Score many signals at once.
+        
+        extract_columns() turns the signals into a columnar batch of raw
+        inputs; combine() then computes every component, attention,
+        preference weighting, final scores and categories as array
+        operations. A columnar batch built elsewhere can go to combine()
+        directly.
+        
+        Deliberate limit: extraction still visits each signal once in
+        Python, because the keyword trie scan of its title/abstract and its
+        convergence-index lookup work on that signal's own text and entities.
+        Only the resulting flags and counts cross into the arrays.
+        
+        Args:
+            signals: Signals to score
+            index: Convergence index over the window (default: built from signals)
+            now: Reference time for recency (default: now)
+            
+        Returns:
+            Dict of unrounded arrays aligned with signals: base_score,
+            attention_score, final_score, category, preference, domain, plus
+            'components' (component name -> points)
         """
-        if not related:
-            return 0
+        columns = self.extract_columns(signals, index)
+        return self.combine(columns, now)
+    
+    def extract_columns(self, signals: List[Dict[str, Any]], index: ConvergenceIndex = None) -> Dict[str, np.ndarray]:
+        """
+        Per-signal raw inputs as columns.
         
-        signal_entities = signal.get('entities', {})
-        signal_companies = set(signal_entities.get('companies', []))
-        signal_techs = set(signal_entities.get('technologies', []))
-        
-        matches = 0
-        for other in related:
-            if other.get('source_id') == signal.get('source_id'):
-                continue
-            if other.get('source') == signal.get('source'):
-                continue  # Must be different source type
-                
-            other_entities = other.get('entities', {})
-            other_companies = set(other_entities.get('companies', []))
-            other_techs = set(other_entities.get('technologies', []))
+        Returns:
+            Dict of arrays: matches (convergence matches, capped at 2), one
+            boolean per keyword feature (government, trl_5_7, tier1, tier2,
+            ma, impact, macro), source, tier (explicit entity tier, 0 if
+            unset), the attention inputs (osint_multiplier, reddit_score,
+            num_comments, signal_day; NaN signal_day where the date is
+            unknown) and domain
+        """
+        if index is None:
+            index = ConvergenceIndex(signals)
+        
+        n = len(signals)
+        matches = np.zeros(n)
+        flags = {name: np.zeros(n, dtype=bool) for name in FEATURE_FLAGS}
+        source = np.empty(n, dtype=object)
+        tier = np.zeros(n)
+        osint_multiplier = np.ones(n)
+        reddit_score = np.zeros(n)
+        num_comments = np.zeros(n)
+        signal_day = np.full(n, np.nan)
+        domain = np.empty(n, dtype=object)
+        
+        matcher = get_matcher()
+        for i, signal in enumerate(signals):
+            entities = signal.get('entities', {})
+            features = scan_signal(signal)
+            companies = entities.get('companies', [])
+            company_hits = matcher.scan(' '.join(companies)) if companies else {}
             
-            # Check for overlap
-            if signal_companies & other_companies or signal_techs & other_techs:
-                matches += 1
+            matches[i] = index.match_count(signal, limit=2)
+            flags['government'][i] = 'government' in features
+            flags['trl_5_7'][i] = any(f'trl:{trl}' in features for trl in TRL_KEYWORDS if trl >= 5)
+            for hits in (features, company_hits):
+                flags['tier1'][i] |= 'tier1' in hits or 'tier1_vc' in hits
+                flags['tier2'][i] |= 'tier2' in hits
+            for name in ('ma', 'impact', 'macro'):
+                flags[name][i] = name in features
+            
+            source[i] = signal.get('source')
+            tier[i] = entities.get('tier') if entities.get('tier') in (1, 2) else 0
+            osint_multiplier[i] = entities.get('attention_multiplier', 1.0)
+            reddit_score[i] = entities.get('reddit_score', 0) or 0
+            num_comments[i] = entities.get('num_comments', 0) or 0
+            day = self._signal_day(signal)
+            if day is not None:
+                signal_day[i] = day
+            domain[i] = signal.get('domain')
+        
+        return {
+            'matches': matches,
+            **flags,
+            'source': source,
+            'tier': tier,
+            'osint_multiplier': osint_multiplier,
+            'reddit_score': reddit_score,
+            'num_comments': num_comments,
+            'signal_day': signal_day,
+            'domain': domain
+        }
+    
+    def component_points(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Base component points from extracted columns, same rules as the _score_* methods."""
+        matches = columns['matches']
+        tier = columns['tier']
+        points = {
+            'convergence': np.select([matches >= 2, matches == 1], [3.0, 1.5], 0.0),
+            'government': np.where(
+                columns['government'] | np.isin(columns['source'], GOVERNMENT_SOURCES), 2.0, 0.0
+            ),
+            # No funding data in the entity columns yet, as in _score_capital
+            'capital': np.zeros(len(matches)),
+            'trl': np.where(columns['trl_5_7'], 2.0, 0.0),
+            'player': np.select(
+                [tier == 1, tier == 2, columns['tier1'], columns['tier2']], [2.0, 1.0, 2.0, 1.0], 0.0
+            ),
+            'ma_likelihood': columns['ma'].astype(float),
+            'impact': columns['impact'].astype(float),
+            'macro': columns['macro'].astype(float),
+        }
+        return {name: points[name] for name in COMPONENTS}
+    
+    def combine(self, columns: Dict[str, np.ndarray], now: datetime = None) -> Dict[str, Any]:
+        """Turn extracted columns into component points, attention, final scores and categories."""
+        now = now or datetime.now()
+        
+        # Attention multiplier (0-3), same rules as _score_attention
+        multiplier = columns['osint_multiplier']
+        reddit_score = columns['reddit_score']
+        num_comments = columns['num_comments']
+        attention = np.select([multiplier > 1.5, multiplier > 1.0], [1.5, 0.5], 0.0)
+        attention += np.select(
+            [(reddit_score > 100) | (num_comments > 50), (reddit_score > 50) | (num_comments > 20)],
+            [1.0, 0.5], 0.0
+        )
+        # One "today" for the whole batch; undated signals count as brand new
+        today = epoch_day(now)
+        days_old = today - np.nan_to_num(columns['signal_day'], nan=today)
+        attention += np.select([days_old <= 7, days_old <= 30], [0.5, 0.25], 0.0)
+        attention = np.minimum(attention, 3.0)
+        
+        return self.combine_components(self.component_points(columns), attention, columns['domain'])
+    
+    def combine_components(self, components: Dict[str, np.ndarray], attention: np.ndarray,
+                           domain: np.ndarray) -> Dict[str, Any]:
+        """
+        Final combination step: base score, preference weighting and category.
+        
+        This is the only part of scoring that depends on preference weights
+        and thresholds, so stored components can be recombined cheaply when
+        either changes (see rescore()).
+        """
+        base = sum(components.values()) if components else np.zeros(len(attention))
+        if self.feature_preferences:
+            preference = np.array([
+                self._preference_weight(d, p, t, a) or 1.0
+                for d, p, t, a in zip(domain, components['player'], components['trl'], attention)
+            ])
+        else:
+            preference = np.array([self.user_preferences.get(d, 1.0) if d else 1.0 for d in domain])
+        final = base * (1 + attention * 0.2) * preference
+        
+        category = np.select(
+            [final >= SCORE_CRITICAL, final >= SCORE_STRONG, final >= SCORE_INTERESTING],
+            ['critical', 'strong', 'interesting'], 'filtered'
+        )
+        
+        return {
+            'base_score': base,
+            'attention_score': attention,
+            'final_score': final,
+            'category': category,
+            'preference': preference,
+            'components': components,
+            'domain': domain
+        }
+    
+    def rescore(self, db) -> int:
+        """
+        Recombine every stored score with the current preferences and thresholds.
+        
+        Reads the persisted component points and attention, reruns only the
+        combination step as one array pass and writes the results back.
+        
+        Returns:
+            Number of scores updated
+        """
+        rows = db.get_score_components()
+        if not rows['signal_id']:
+            return 0
+        components = {name: np.array(rows[name], dtype=float) for name in COMPONENTS}
+        attention = np.array(rows['attention_score'], dtype=float)
+        domain = np.array(rows['domain'], dtype=object)
+        
+        batch = self.combine_components(components, attention, domain)
+        db.update_final_scores(zip(
+            np.round(batch['base_score'], 2).tolist(),
+            np.round(batch['final_score'], 2).tolist(),
+            batch['category'].tolist(),
+            batch['preference'].tolist(),
+            rows['signal_id']
+        ))
+        return len(rows['signal_id'])
+    
+    def batch_results(self, batch: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Per-signal result dicts, shaped like score(), from a score_batch() result."""
+        results = []
+        for i in range(len(batch['final_score'])):
+            breakdown = {name: float(values[i]) for name, values in batch['components'].items()}
+            breakdown['attention'] = float(batch['attention_score'][i])
+            preference_weight = self._preference_weight(
+                batch['domain'][i], breakdown['player'], breakdown['trl'], breakdown['attention']
+            )
+            if preference_weight is not None:
+                breakdown['preference_adjustment'] = preference_weight
+            results.append({
+                'base_score': round(float(batch['base_score'][i]), 2),
+                'attention_score': round(float(batch['attention_score'][i]), 2),
+                'final_score': round(float(batch['final_score'][i]), 2),
+                'category': str(batch['category'][i]),
+                'breakdown': breakdown
+            })
+        return results
+    
+    def _preference_weight(self, domain: Optional[str], player: float, trl: float,
+                           attention: float) -> Optional[float]:
+        """
+        Product of the learned weights matching a signal's domain, player
+        tier, TRL band and attention bucket, or None if no weight applies.
+        """
+        weights = []
+        if domain and domain in self.user_preferences:
+            weights.append(self.user_preferences[domain])
+        if self.feature_preferences:
+            for feature_type, key in feature_keys(player, trl, attention).items():
+                weight = self.feature_preferences.get(feature_type, {}).get(key)
+                if weight is not None:
+                    weights.append(weight)
+        return math.prod(weights) if weights else None
+    
+    @staticmethod
+    def _signal_day(signal: Dict[str, Any]) -> Optional[int]:
+        """
+        Days since epoch of a signal's date, or None if unknown.
+        
+        Stored signals carry signal_day, set once at ingestion; only signals
+        that haven't been stored yet are parsed here.
+        """
+        if signal.get('signal_day') is not None:
+            return int(signal['signal_day'])
+        signal_date = signal.get('date') or signal.get('signal_date')
+        if not signal_date:
+            return None
+        if isinstance(signal_date, str):
+            try:
+                signal_date = datetime.strptime(signal_date[:10], '%Y-%m-%d')
+            except ValueError:
+                return None
+        return epoch_day(signal_date)
+    
+    def _score_convergence(self, signal: Dict, related: List[Dict], index: ConvergenceIndex = None) -> float:
+        """
+        +3 if ≥2 independent sources on same tech/company within 90 days.
+        """
+        if index is None:
+            if not related:
+                return 0
+            index = ConvergenceIndex(related)
+        
+        matches = index.match_count(signal, limit=2)
         
         if matches >= 2:
             return 3
@@ -160,25 +424,18 @@ class ScoringEngine:
             return 1.5
         return 0
     
-    def _score_government_alignment(self, signal: Dict) -> float:
+    def _score_government_alignment(self, signal: Dict, features: Dict = None) -> float:
         """
         +2 if matches announced policy (IRA, CHIPS, Net Zero, etc.)
         """
-        gov_keywords = [
-            'inflation reduction act', 'ira', 'chips act', 'arpa-e',
-            'net zero', 'green deal', 'repowereu', 'doe grant',
-            'department of energy', 'nrc', 'nuclear regulatory',
-            'innovate uk', 'ukri', 'horizon europe'
-        ]
-        
-        text = f"{signal.get('title', '')} {signal.get('abstract', '')}".lower()
+        if features is None:
+            features = scan_signal(signal)
         
-        for kw in gov_keywords:
-            if kw in text:
-                return 2
+        if 'government' in features:
+            return 2
         
         # Check source - if from government, automatic alignment
-        if signal.get('source') in ['doe', 'ukri', 'arpa-e', 'nrc']:
+        if signal.get('source') in GOVERNMENT_SOURCES:
             return 2
         
         return 0
@@ -194,26 +451,19 @@ class ScoringEngine:
         # Will be populated when we add SEC/Crunchbase collectors
         return 0
     
-    def _score_trl(self, signal: Dict) -> float:
+    def _score_trl(self, signal: Dict, features: Dict = None) -> float:
         """
         +2 for TRL 5-7 (component validation through field trial)
         """
-        trl_keywords = {
-            7: ["field trial", "pilot", "commercial deployment", "customer validation", "production"],
-            6: ["demonstration", "prototype", "system test", "validated"],
-            5: ["component", "subsystem", "proof of concept"],
-        }
-        
-        text = f"{signal.get('title', '')} {signal.get('abstract', '')}".lower()
+        if features is None:
+            features = scan_signal(signal)
         
-        for trl, keywords in sorted(trl_keywords.items(), reverse=True):
-            for kw in keywords:
-                if kw in text:
-                    if trl >= 5:
-                        return 2
+        for trl in sorted(TRL_KEYWORDS, reverse=True):
+            if f'trl:{trl}' in features and trl >= 5:
+                return 2
         return 0
     
-    def _score_player(self, signal: Dict) -> float:
+    def _score_player(self, signal: Dict, features: Dict = None) -> float:
         """
         +2 for Tier 1 player, +1 for Tier 2
         """
@@ -227,67 +477,50 @@ class ScoringEngine:
             return 1
         
         # Check company names
-        text = f"{signal.get('title', '')} {signal.get('abstract', '')} {' '.join(companies)}".lower()
+        if features is None:
+            features = scan_signal(signal)
+        company_hits = get_matcher().scan(' '.join(companies)) if companies else {}
         
-        for company in TIER_1_COMPANIES + TIER_1_VCS:
-            if company.lower() in text:
+        for hits in (features, company_hits):
+            if 'tier1' in hits or 'tier1_vc' in hits:
                 return 2
         
-        for company in TIER_2_COMPANIES:
-            if company.lower() in text:
+        for hits in (features, company_hits):
+            if 'tier2' in hits:
                 return 1
         
         return 0
     
-    def _score_ma_likelihood(self, signal: Dict) -> float:
+    def _score_ma_likelihood(self, signal: Dict, features: Dict = None) -> float:
         """
         +1 if strategic acquirer active in space + startup fills gap
         """
         # M&A signals - harder to detect from patents alone
         # Look for partnership/licensing language
-        ma_keywords = ['license', 'partnership', 'collaboration', 'joint venture', 'acquisition']
-        text = f"{signal.get('title', '')} {signal.get('abstract', '')}".lower()
+        if features is None:
+            features = scan_signal(signal)
         
-        for kw in ma_keywords:
-            if kw in text:
-                return 1
-        return 0
+        return 1 if 'ma' in features else 0
     
-    def _score_impact(self, signal: Dict) -> float:
+    def _score_impact(self, signal: Dict, features: Dict = None) -> float:
         """
         +1 for 5-10x improvement claims + commercially viable
         """
-        impact_keywords = [
-            '10x', 'ten times', 'order of magnitude', 'breakthrough',
-            'revolutionary', 'novel', 'first', 'unprecedented',
-            'significantly improved', 'substantially reduced'
-        ]
-        
-        text = f"{signal.get('title', '')} {signal.get('abstract', '')}".lower()
+        if features is None:
+            features = scan_signal(signal)
         
-        for kw in impact_keywords:
-            if kw in text:
-                return 1
-        return 0
+        return 1 if 'impact' in features else 0
     
-    def _score_macro(self, signal: Dict) -> float:
+    def _score_macro(self, signal: Dict, features: Dict = None) -> float:
         """
         +1 for energy security, US-China decoupling, climate themes
         """
-        macro_keywords = [
-            'energy security', 'grid resilience', 'domestic supply',
-            'decarbonization', 'net zero', 'climate', 'carbon',
-            'supply chain', 'reshoring', 'critical minerals'
-        ]
+        if features is None:
+            features = scan_signal(signal)
         
-        text = f"{signal.get('title', '')} {signal.get('abstract', '')}".lower()
-        
-        for kw in macro_keywords:
-            if kw in text:
-                return 1
-        return 0
+        return 1 if 'macro' in features else 0
     
-    def _score_attention(self, signal: Dict) -> float:
+    def _score_attention(self, signal: Dict, now: datetime = None) -> float:
         """
         Attention multiplier (0-3):
         +3: Top citations, stock moves, viral
@@ -314,22 +547,16 @@ class ScoringEngine:
             attention += 0.5
         
         # Recency bonus
-        signal_date = signal.get('date')
-        if signal_date:
-            if isinstance(signal_date, str):
-                try:
-                    signal_date = datetime.strptime(signal_date, '%Y-%m-%d')
-                except ValueError:
-                    signal_date = datetime.now()
-            
-            days_old = (datetime.now() - signal_date).days
+        signal_day = self._signal_day(signal)
+        if signal_day is not None:
+            days_old = epoch_day(now or datetime.now()) - signal_day
             
             if days_old <= 7:
                 attention += 0.5  # Fresh
             elif days_old <= 30:
                 attention += 0.25
         else:
-            attention += 0.5  # Default for new signals
+            attention += 0.5  # Default for new or undated signals
         
         return min(attention, 3.0)  # Cap at 3
 
@@ -339,9 +566,10 @@ def score_signals(signals: List[Dict], engine: ScoringEngine = None) -> List[Dic
     if engine is None:
         engine = ScoringEngine()
     
+    index = ConvergenceIndex(signals)  # All signals count for convergence
+    batch = engine.score_batch(signals, index=index)
     scored = []
-    for signal in signals:
-        score_result = engine.score(signal, signals)  # Pass all for convergence
+    for signal, score_result in zip(signals, engine.batch_results(batch)):
         scored.append({
             **signal,
             'score': score_result
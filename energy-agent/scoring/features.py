@@ -0,0 +1,130 @@
+"""
+Shared keyword matching for scoring and entity extraction.
+
+Every keyword list in config/settings.py (technology domains, player tiers and
+the scoring lists) is compiled into one word-level trie. A text is tokenised
+once and walked through the trie once, returning every category that matched
+and which of its keywords did. Scorers and collectors read from that scan
+instead of looping over their own lists with substring checks.
+
+Matching is case-insensitive on whole words: 'GE' matches "GE Vernova" but not
+"general", and 'ira' no longer matches inside "spiral". Punctuation separates
+words, so 'direct-to-chip' also matches "direct to chip".
+"""
+from typing import Dict, List, Iterable, Optional
+import re
+import threading
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import (
+    TECHNOLOGY_KEYWORDS, TIER_1_COMPANIES, TIER_1_VCS, TIER_2_COMPANIES,
+    GOVERNMENT_KEYWORDS, TRL_KEYWORDS, MA_KEYWORDS, IMPACT_KEYWORDS, MACRO_KEYWORDS
+)
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+
+# Trie node key holding the (category, keyword) pairs that end at that node
+_END = ''
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of a text."""
+    return WORD_RE.findall(text.lower()) if text else []
+
+
+def default_categories() -> Dict[str, List[str]]:
+    """Category -> keywords for every keyword list in the settings."""
+    categories = {f'tech:{domain}': keywords for domain, keywords in TECHNOLOGY_KEYWORDS.items()}
+    categories.update({
+        'tier1': TIER_1_COMPANIES,
+        'tier1_vc': TIER_1_VCS,
+        'tier2': TIER_2_COMPANIES,
+        'government': GOVERNMENT_KEYWORDS,
+        'ma': MA_KEYWORDS,
+        'impact': IMPACT_KEYWORDS,
+        'macro': MACRO_KEYWORDS,
+    })
+    for level, keywords in TRL_KEYWORDS.items():
+        categories[f'trl:{level}'] = keywords
+    return categories
+
+
+class KeywordMatcher:
+    """Word-level trie over many keyword lists."""
+
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        """
+        Args:
+            categories: Category name -> keywords; a keyword may appear in
+                several categories
+        """
+        self._root: Dict[str, dict] = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                words = tokenize(keyword)
+                if not words:
+                    continue
+                node = self._root
+                for word in words:
+                    node = node.setdefault(word, {})
+                node.setdefault(_END, []).append((category, keyword))
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """
+        Find every keyword in a text.
+
+        Returns:
+            Category -> matched keywords, each listed once in order of first
+            appearance. Categories without a match are absent.
+        """
+        return self.scan_tokens(tokenize(text))
+
+    def scan_tokens(self, tokens: List[str]) -> Dict[str, List[str]]:
+        """scan() for an already tokenised text."""
+        hits: Dict[str, List[str]] = {}
+        root = self._root
+        for start in range(len(tokens)):
+            node = root.get(tokens[start])
+            i = start
+            while node is not None:
+                for category, keyword in node.get(_END, ()):
+                    found = hits.setdefault(category, [])
+                    if keyword not in found:
+                        found.append(keyword)
+                i += 1
+                if i == len(tokens):
+                    break
+                node = node.get(tokens[i])
+        return hits
+
+
+_shared_matcher: Optional[KeywordMatcher] = None
+_shared_lock = threading.Lock()
+
+
+def get_matcher() -> KeywordMatcher:
+    """Return the process-wide matcher over the settings keyword lists."""
+    global _shared_matcher
+    with _shared_lock:
+        if _shared_matcher is None:
+            _shared_matcher = KeywordMatcher(default_categories())
+        return _shared_matcher
+
+
+def scan_signal(signal: Dict) -> Dict[str, List[str]]:
+    """Scan a signal's title and abstract once for every keyword category."""
+    return get_matcher().scan(f"{signal.get('title', '')} {signal.get('abstract', '')}")
+
+
+def technology_domains(hits: Dict[str, List[str]]) -> List[str]:
+    """Technology domains matched by a scan, in settings order."""
+    return [domain for domain in TECHNOLOGY_KEYWORDS if f'tech:{domain}' in hits]
+
+
+def matched_companies(hits: Dict[str, List[str]], category: str, names: List[str]) -> List[str]:
+    """Names from a tier list that a scan matched, in list order."""
+    found = set(hits.get(category, ()))
+    return [name for name in names if name in found]
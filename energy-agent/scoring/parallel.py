@@ -0,0 +1,96 @@
+"""
+Multi-process scoring for large backlogs.
+
+After an outage or a backfill there can be tens of thousands of unscored
+signals, and scoring them on one core dominates the run. Here the unscored
+ids are split into contiguous id ranges and each range is read and scored by
+a worker process.
+
+The keyword trie and the convergence window are built once in the parent
+before the pool starts; workers are forked, so they inherit both read-only
+instead of rebuilding them. Workers only read from the database, each on its
+own connection; the parent saves each finished shard with save_scores_bulk()
+in one transaction, so writers never contend for the SQLite lock.
+"""
+from datetime import datetime
+from typing import Dict, Any, List, Tuple
+import logging
+import multiprocessing
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import SCORING_SHARD_SIZE, SCORING_WORKERS
+from scoring.convergence import WindowedConvergenceIndex
+from scoring.engine import ScoringEngine
+from scoring.features import get_matcher
+from scoring.preferences import get_preferences
+
+logger = logging.getLogger(__name__)
+
+# Read-only state set by the parent and inherited by forked workers
+_worker_state: Dict[str, Any] = {}
+
+
+def id_shards(ids: List[int], shard_size: int) -> List[Tuple[int, int]]:
+    """Split ascending ids into (first_id, last_id) ranges of up to shard_size ids."""
+    return [
+        (ids[start], ids[min(start + shard_size, len(ids)) - 1])
+        for start in range(0, len(ids), shard_size)
+    ]
+
+
+def _score_shard(shard: Tuple[int, int]) -> List[Tuple[int, Dict[str, Any]]]:
+    """Worker: read and score one id range, returning (signal_id, result) pairs."""
+    db = _worker_state['db']
+    engine = _worker_state['engine']
+    signals = db.get_unscored_signals_in_range(*shard)
+    batch = engine.score_batch(signals, index=_worker_state['index'], now=_worker_state['now'])
+    return [(signal['id'], result) for signal, result in zip(signals, engine.batch_results(batch))]
+
+
+def score_parallel(db, engine: ScoringEngine = None, index: WindowedConvergenceIndex = None,
+                   workers: int = None, shard_size: int = None, now: datetime = None) -> int:
+    """
+    Score every unscored signal in the database across worker processes.
+
+    Args:
+        db: SignalDatabase to read signals from and save scores to
+        engine: Scoring engine (default: one using the learned preferences)
+        index: Convergence window (default: the database window ending at now)
+        workers: Worker processes (default: SCORING_WORKERS)
+        shard_size: Signals per shard (default: SCORING_SHARD_SIZE)
+        now: Reference time for attention and the window (default: now)
+
+    Returns:
+        Number of signals scored
+    """
+    ids = db.get_unscored_ids()
+    if not ids:
+        return 0
+
+    now = now or datetime.now()
+    engine = engine or ScoringEngine.from_preferences(get_preferences(db))
+    index = index or WindowedConvergenceIndex(db, now=now)
+    shards = id_shards(ids, shard_size or SCORING_SHARD_SIZE)
+    workers = max(1, min(workers or SCORING_WORKERS, len(shards)))
+
+    # Build shared read-only state before forking so workers inherit it
+    get_matcher()
+    _worker_state.update(db=db, engine=engine, index=index, now=now)
+
+    count = 0
+    try:
+        if workers == 1 or 'fork' not in multiprocessing.get_all_start_methods():
+            for scores in map(_score_shard, shards):
+                count += db.save_scores_bulk(scores)
+        else:
+            with multiprocessing.get_context('fork').Pool(workers) as pool:
+                for scores in pool.imap_unordered(_score_shard, shards):
+                    count += db.save_scores_bulk(scores)
+    finally:
+        _worker_state.clear()
+
+    logger.info(f"Scored {count} signals in {len(shards)} shards with {workers} worker(s)")
+    return count
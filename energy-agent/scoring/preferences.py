@@ -0,0 +1,155 @@
+"""
+Preference learning from user ratings.
+
+Each rating nudges the weights of the rated signal's features: its domain,
+player tier, TRL band and attention bucket. Weights are learned online: every
+run folds only the ratings added since the previous one into running totals
+(sample_count, reward_sum) in user_preferences, so the cost of a run does not
+grow with the rating history.
+
+A weight measures how much better a feature is rated than signals overall:
+1 + (reward_sum - samples * mean) / (samples + prior), where mean is the
+mean reward over every rating, clamped to 1 ± PREFERENCE_MAX_ADJUSTMENT.
+Being relative, weights don't inflate every score when most ratings are
+positive. The scoring engine multiplies the weights of a signal's features
+into its preference adjustment.
+
+The engine reads weights through a versioned snapshot cached per process.
+Learning bumps the version; loading checks it with one small query and only
+rereads the weights when it changed, so scoring never waits on rating volume.
+"""
+from collections import defaultdict
+from typing import Dict, Any, Optional, Tuple
+import logging
+import threading
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import (
+    PREFERENCE_RATING_REWARDS, PREFERENCE_PRIOR_SAMPLES, PREFERENCE_MAX_ADJUSTMENT
+)
+
+logger = logging.getLogger(__name__)
+
+# Preference types learned besides 'domain', in the order they are applied
+FEATURE_TYPES = ('player_tier', 'trl', 'attention')
+
+# Totals over every rating, the baseline each weight is measured against
+BASELINE = ('overall', 'all')
+
+
+def player_tier_key(points: float) -> str:
+    """Player tier bucket from the player component points."""
+    if points >= 2:
+        return 'tier1'
+    if points >= 1:
+        return 'tier2'
+    return 'none'
+
+
+def trl_key(points: float) -> str:
+    """TRL band from the TRL component points."""
+    return 'trl5_7' if points > 0 else 'unknown'
+
+
+def attention_key(attention: float) -> str:
+    """Attention bucket from the attention score (0-3)."""
+    if attention >= 1.5:
+        return 'high'
+    if attention >= 0.5:
+        return 'medium'
+    return 'low'
+
+
+def feature_keys(player: float, trl: float, attention: float) -> Dict[str, str]:
+    """Preference type -> key for a signal's scored features."""
+    return {
+        'player_tier': player_tier_key(player),
+        'trl': trl_key(trl),
+        'attention': attention_key(attention),
+    }
+
+
+class PreferenceSnapshot:
+    """Learned weights at one version: type -> key -> weight."""
+
+    def __init__(self, version: int, weights: Dict[str, Dict[str, float]]):
+        self.version = version
+        self.weights = weights
+
+    @property
+    def domain(self) -> Dict[str, float]:
+        """Domain -> weight, as taken by ScoringEngine(user_preferences=...)."""
+        return self.weights.get('domain', {})
+
+    @property
+    def features(self) -> Dict[str, Dict[str, float]]:
+        """Weights of the non-domain feature types."""
+        return {t: self.weights[t] for t in FEATURE_TYPES if self.weights.get(t)}
+
+
+_snapshot: Optional[Tuple[str, PreferenceSnapshot]] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_preferences(db) -> PreferenceSnapshot:
+    """Current weights for a database, reloaded only when their version changed."""
+    global _snapshot
+    with _snapshot_lock:
+        version = db.get_preference_version()
+        if _snapshot is None or _snapshot[0] != db.db_path or _snapshot[1].version != version:
+            version, weights = db.get_all_preference_weights()
+            _snapshot = (db.db_path, PreferenceSnapshot(version, weights))
+        return _snapshot[1]
+
+
+def learn_preferences(db, batch_size: int = 10000) -> Dict[str, Any]:
+    """
+    Fold ratings added since the last run into the learned weights.
+
+    Ratings are read in id order and applied batch by batch, each batch in
+    one transaction together with the new learning position.
+
+    Returns:
+        Dict with ratings learned from, preference keys updated and the
+        resulting version
+    """
+    ratings = 0
+    keys = set()
+    version = db.get_preference_version()
+
+    while True:
+        rows = db.get_ratings_for_learning(limit=batch_size)
+        if not rows:
+            break
+
+        updates = defaultdict(lambda: [0, 0.0])
+        for row in rows:
+            reward = PREFERENCE_RATING_REWARDS.get(row['rating'])
+            if reward is None:
+                continue
+            features = {BASELINE[0]: BASELINE[1]}
+            if row['domain']:
+                features['domain'] = row['domain']
+            if row['player'] is not None:
+                features.update(feature_keys(row['player'], row['trl'] or 0, row['attention_score'] or 0))
+            for feature in features.items():
+                updates[feature][0] += 1
+                updates[feature][1] += reward
+
+        version = db.apply_preference_updates(
+            {feature: tuple(total) for feature, total in updates.items()},
+            last_rating_id=rows[-1]['id'],
+            baseline=BASELINE,
+            prior_samples=PREFERENCE_PRIOR_SAMPLES,
+            max_adjustment=PREFERENCE_MAX_ADJUSTMENT
+        )
+        ratings += len(rows)
+        keys.update(feature for feature in updates if feature != BASELINE)
+        if len(rows) < batch_size:
+            break
+
+    logger.info(f"Learned from {ratings} ratings, {len(keys)} preference keys updated (version {version})")
+    return {'ratings': ratings, 'keys': len(keys), 'version': version}